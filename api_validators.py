@@ -3,12 +3,36 @@ API Response Validators
 Validates API responses and alerts when structure changes.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import random
+import secrets
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from logger import get_logger
 
+# Optional fast JSON parser (falls back to stdlib json)
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
 
-@dataclass
+
+def parse_json(response) -> Any:
+    """
+    Decode an HTTP response body into Python objects.
+    
+    Uses orjson on the raw bytes when installed (several times faster on the
+    bulk GMGN/Cielo payloads), otherwise stdlib json. Callers feeding the
+    validators should prefer this over response.json().
+    """
+    return _json_impl.loads(response.content)
+
+
+@dataclass(slots=True)
 class ValidationResult:
     """Result of validating an API response."""
     valid: bool
@@ -17,6 +41,154 @@ class ValidationResult:
     warnings: List[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class _SchemaStep:
+    """One level of a response envelope and the alerts raised when it is malformed."""
+    keys: Tuple[str, ...]                 # Candidate keys, first non-null one wins
+    missing_error: str
+    missing_alert: Optional[str] = None   # api_alert text when absent (None = silent)
+    expected_type: Optional[type] = None  # Required container type (None = any)
+    type_alert: Optional[str] = None
+    type_error: Optional[str] = None
+    require_zero: bool = False            # Status-code check: must be 0, not descended into
+    optional: bool = False                # Absent value is valid, reported as a warning
+
+
+def _schema_failure(api_name: str, alert: Optional[str], label: str, error: str,
+                    expected_type: Optional[type] = None, got: Any = None) -> ValidationResult:
+    """Cold path of a compiled schema: raise the API alert (if any) and build the failed result."""
+    if alert:
+        if expected_type is None:
+            get_logger().api_alert(api_name, alert.format(label=label))
+        else:
+            get_logger().api_alert(api_name, alert.format(label=label), expected_type.__name__, type(got).__name__)
+    return ValidationResult(valid=False, error=error)
+
+
+def _compile_schema(api_name: str, root_alert: str, steps: Tuple[_SchemaStep, ...]) -> Callable:
+    """
+    Compile an envelope spec into a single validation closure, built once at import.
+    
+    The returned check(response, label) walks the precompiled steps and returns
+    (leaf, None) on success or (None, ValidationResult) as soon as a level fails.
+    Alert texts may reference {label} (e.g. the endpoint type).
+    
+    Responses are plain decoded JSON, so exact `type(x) is dict` checks are used
+    instead of isinstance(); all failure handling lives in _schema_failure().
+    """
+    # Flatten steps into tuples so the hot loop unpacks locals instead of reading attributes
+    compiled = tuple(
+        (step.keys, step.expected_type, step.require_zero, step.optional, step)
+        for step in steps
+    )
+    
+    def check(response: Any, label: str = "") -> Tuple[Any, Optional[ValidationResult]]:
+        if type(response) is not dict:
+            return None, _schema_failure(api_name, root_alert, label, "Response is not a dictionary", dict, response)
+        
+        node = response
+        for keys, expected_type, require_zero, optional, step in compiled:
+            value = None
+            for key in keys:
+                value = node.get(key)
+                if value is not None:
+                    break
+            
+            if value is None:
+                if optional:
+                    return None, ValidationResult(valid=True, data=None, warnings=[step.missing_error])
+                return None, _schema_failure(api_name, step.missing_alert, label, step.missing_error)
+            
+            if require_zero:
+                if value != 0:
+                    # This is a normal API error, not a schema change
+                    return None, ValidationResult(valid=False, error=f"API returned error code: {value}")
+                continue
+            
+            if expected_type is not None and type(value) is not expected_type:
+                return None, _schema_failure(api_name, step.type_alert, label, step.type_error, expected_type, value)
+            
+            node = value
+        
+        return node, None
+    
+    return check
+
+
+_GMGN_CODE_STEP = _SchemaStep(
+    keys=("code",), require_zero=True,
+    missing_alert="Missing 'code' field in {label} response", missing_error="Missing 'code' field",
+)
+
+_TOKEN_INFO_SCHEMA = _compile_schema("GMGN", "Token info response is not a dict", (
+    _GMGN_CODE_STEP,
+    _SchemaStep(
+        keys=("data",), expected_type=list,
+        missing_alert="Missing 'data' field in successful response", missing_error="Missing 'data' field",
+        type_alert="Token info 'data' is not a list", type_error="'data' is not a list",
+    ),
+))
+
+_TRADERS_SCHEMA = _compile_schema("GMGN", "{label} response is not a dict", (
+    _GMGN_CODE_STEP,
+    _SchemaStep(
+        keys=("data",), expected_type=dict,
+        missing_alert="Missing 'data' field in {label} response", missing_error="Missing 'data' field",
+        type_alert="{label} 'data' is not a dict", type_error="'data' is not a dictionary",
+    ),
+    _SchemaStep(
+        keys=("list", "holders"), expected_type=list,
+        missing_alert="{label} missing 'list' or 'holders' in data",
+        missing_error="Missing 'list' or 'holders' field",
+        type_alert="{label} items is not a list", type_error="Items is not a list",
+    ),
+))
+
+_RANK_SCHEMA = _compile_schema("GMGN", "Rank response is not a dict", (
+    _GMGN_CODE_STEP,
+    _SchemaStep(
+        keys=("data",), expected_type=dict,
+        missing_alert="Missing 'data' field in rank response", missing_error="Missing 'data' field",
+        type_alert="Rank 'data' is not a dict", type_error="'data' is not a dictionary",
+    ),
+    _SchemaStep(
+        keys=("rank",), expected_type=list,
+        missing_alert="Missing 'rank' field in rank data", missing_error="Missing 'rank' list",
+        type_alert="Rank list is not a list", type_error="Rank list is not a list",
+    ),
+))
+
+_CIELO_STATS_SCHEMA = _compile_schema("CIELO", "Response is not a dict", (
+    _SchemaStep(
+        keys=("result",), expected_type=dict,
+        missing_alert="Missing 'result' field - tRPC structure may have changed",
+        missing_error="Missing 'result' field",
+        type_alert="'result' is not a dict", type_error="'result' is not a dictionary",
+    ),
+    _SchemaStep(
+        keys=("data",), expected_type=dict,
+        missing_alert="Missing 'result.data' field", missing_error="Missing nested 'data' field",
+        type_alert="'result.data' is not a dict", type_error="Nested 'data' is not a dictionary",
+    ),
+    _SchemaStep(
+        keys=("json",), expected_type=dict,
+        missing_alert="Missing 'result.data.json' field - tRPC structure changed",
+        missing_error="Missing 'json' wrapper",
+        type_alert="'result.data.json' is not a dict", type_error="'json' wrapper is not a dictionary",
+    ),
+    _SchemaStep(
+        keys=("data",), expected_type=dict, optional=True,
+        missing_error="No inner data (wallet may have no activity)",
+        type_alert="Wallet stats 'data' is not a dict", type_error="Inner 'data' is not a dictionary",
+    ),
+))
+
+
+# Item fields checked on the first trader/holder entry
+_TRADER_REQUIRED = frozenset({"address"})
+_TRADER_EXPECTED = frozenset({"profit", "is_suspicious", "maker_token_tags"})
+
+
 class GMGNValidator:
     """Validates GMGN API responses."""
     
@@ -45,31 +217,9 @@ class GMGNValidator:
     @staticmethod
     def validate_token_info(response: Dict) -> ValidationResult:
         """Validate token info response from GMGN."""
-        logger = get_logger()
-        
-        # Check response code
-        if not isinstance(response, dict):
-            logger.api_alert("GMGN", "Token info response is not a dict", "dict", type(response).__name__)
-            return ValidationResult(valid=False, error="Response is not a dictionary")
-        
-        code = response.get("code")
-        if code is None:
-            logger.api_alert("GMGN", "Missing 'code' field in token info response")
-            return ValidationResult(valid=False, error="Missing 'code' field")
-        
-        if code != 0:
-            # This is a normal API error, not a schema change
-            return ValidationResult(valid=False, error=f"API returned error code: {code}")
-        
-        # Check data structure
-        data = response.get("data")
-        if data is None:
-            logger.api_alert("GMGN", "Missing 'data' field in successful response")
-            return ValidationResult(valid=False, error="Missing 'data' field")
-        
-        if not isinstance(data, list):
-            logger.api_alert("GMGN", "Token info 'data' is not a list", "list", type(data).__name__)
-            return ValidationResult(valid=False, error="'data' is not a list")
+        data, failure = _TOKEN_INFO_SCHEMA(response, "token info")
+        if failure is not None:
+            return failure
         
         if not data:
             return ValidationResult(valid=True, data=None, warnings=["Empty token info returned"])
@@ -79,7 +229,7 @@ class GMGNValidator:
         warnings = []
         
         if "symbol" not in token:
-            logger.api_alert("GMGN", "Token info missing 'symbol' field")
+            get_logger().api_alert("GMGN", "Token info missing 'symbol' field")
             warnings.append("Missing 'symbol' field")
         
         if "ath_price" not in token and "highest_price" not in token:
@@ -90,102 +240,38 @@ class GMGNValidator:
     @staticmethod
     def validate_traders_response(response: Dict, endpoint_type: str) -> ValidationResult:
         """Validate traders/holders response from GMGN."""
-        logger = get_logger()
-        
-        if not isinstance(response, dict):
-            logger.api_alert("GMGN", f"{endpoint_type} response is not a dict", "dict", type(response).__name__)
-            return ValidationResult(valid=False, error="Response is not a dictionary")
-        
-        code = response.get("code")
-        if code is None:
-            logger.api_alert("GMGN", f"Missing 'code' field in {endpoint_type} response")
-            return ValidationResult(valid=False, error="Missing 'code' field")
-        
-        if code != 0:
-            return ValidationResult(valid=False, error=f"API returned error code: {code}")
-        
-        data = response.get("data")
-        if data is None:
-            logger.api_alert("GMGN", f"Missing 'data' field in {endpoint_type} response")
-            return ValidationResult(valid=False, error="Missing 'data' field")
-        
-        if not isinstance(data, dict):
-            logger.api_alert("GMGN", f"{endpoint_type} 'data' is not a dict", "dict", type(data).__name__)
-            return ValidationResult(valid=False, error="'data' is not a dictionary")
-        
-        
-        # Check for list or holders key (handle empty arrays properly)
-        if "list" in data:
-            items = data["list"]
-        elif "holders" in data:
-            items = data["holders"]
-        else:
-            logger.api_alert("GMGN", f"{endpoint_type} missing 'list' or 'holders' in data")
-            return ValidationResult(valid=False, error="Missing 'list' or 'holders' field")
-        
-        if not isinstance(items, list):
-            logger.api_alert("GMGN", f"{endpoint_type} items is not a list", "list", type(items).__name__)
-            return ValidationResult(valid=False, error="Items is not a list")
+        items, failure = _TRADERS_SCHEMA(response, endpoint_type)
+        if failure is not None:
+            return failure
         
         # Validate first item structure (if any)
         warnings = []
         if items:
             first = items[0]
-            required_fields = ["address"]
-            for field in required_fields:
-                if field not in first:
-                    logger.api_alert("GMGN", f"{endpoint_type} item missing required field '{field}'")
-                    warnings.append(f"Missing '{field}' field in items")
+            present = first.keys() if type(first) is dict else frozenset()
+            for field in sorted(_TRADER_REQUIRED - present):
+                get_logger().api_alert("GMGN", f"{endpoint_type} item missing required field '{field}'")
+                warnings.append(f"Missing '{field}' field in items")
             
             # Check for expected fields (not required but warn if missing)
-            expected_fields = ["profit", "is_suspicious", "maker_token_tags"]
-            for field in expected_fields:
-                if field not in first:
-                    warnings.append(f"Expected field '{field}' not found in items")
+            for field in sorted(_TRADER_EXPECTED - present):
+                warnings.append(f"Expected field '{field}' not found in items")
         
         return ValidationResult(valid=True, data=items, warnings=warnings)
     
     @staticmethod
     def validate_rank_response(response: Dict) -> ValidationResult:
         """Validate tokens rank response from GMGN."""
-        logger = get_logger()
-        
-        if not isinstance(response, dict):
-            logger.api_alert("GMGN", "Rank response is not a dict", "dict", type(response).__name__)
-            return ValidationResult(valid=False, error="Response is not a dictionary")
-        
-        code = response.get("code")
-        if code is None:
-            logger.api_alert("GMGN", "Missing 'code' field in rank response")
-            return ValidationResult(valid=False, error="Missing 'code' field")
-        
-        if code != 0:
-            return ValidationResult(valid=False, error=f"API returned error code: {code}")
-        
-        data = response.get("data")
-        if data is None:
-            logger.api_alert("GMGN", "Missing 'data' field in rank response")
-            return ValidationResult(valid=False, error="Missing 'data' field")
-        
-        if not isinstance(data, dict):
-            logger.api_alert("GMGN", "Rank 'data' is not a dict", "dict", type(data).__name__)
-            return ValidationResult(valid=False, error="'data' is not a dictionary")
-        
-        rank_list = data.get("rank")
-        if rank_list is None:
-            logger.api_alert("GMGN", "Missing 'rank' field in rank data")
-            return ValidationResult(valid=False, error="Missing 'rank' list")
-        
-        if not isinstance(rank_list, list):
-            logger.api_alert("GMGN", "Rank list is not a list", "list", type(rank_list).__name__)
-            return ValidationResult(valid=False, error="Rank list is not a list")
+        rank_list, failure = _RANK_SCHEMA(response, "rank")
+        if failure is not None:
+            return failure
             
         # Validate first item structure
         warnings = []
         if rank_list:
             first = rank_list[0]
             if "address" not in first:
-                logger.api_alert("GMGN", "Rank item missing 'address' field")
+                get_logger().api_alert("GMGN", "Rank item missing 'address' field")
                 warnings.append("Missing 'address' field in rank items")
         
         return ValidationResult(valid=True, data=rank_list, warnings=warnings)
@@ -211,52 +297,30 @@ class CieloValidator:
     @staticmethod
     def validate_wallet_stats(response: Dict) -> ValidationResult:
         """Validate wallet stats response from Cielo."""
-        logger = get_logger()
-        
-        if not isinstance(response, dict):
-            logger.api_alert("CIELO", "Response is not a dict", "dict", type(response).__name__)
-            return ValidationResult(valid=False, error="Response is not a dictionary")
-        
         warnings = []
         
-        # Navigate the nested structure
+        # Fast path: well-formed tRPC envelope, plain subscripts with no per-level checks
         try:
-            result = response.get("result")
-            if result is None:
-                logger.api_alert("CIELO", "Missing 'result' field - tRPC structure may have changed")
-                return ValidationResult(valid=False, error="Missing 'result' field")
-            
-            data_wrapper = result.get("data")
-            if data_wrapper is None:
-                logger.api_alert("CIELO", "Missing 'result.data' field")
-                return ValidationResult(valid=False, error="Missing nested 'data' field")
-            
-            json_wrapper = data_wrapper.get("json")
-            if json_wrapper is None:
-                logger.api_alert("CIELO", "Missing 'result.data.json' field - tRPC structure changed")
-                return ValidationResult(valid=False, error="Missing 'json' wrapper")
-            
-            if json_wrapper is None:
-                return ValidationResult(valid=True, data=None, warnings=["Null json data"])
-            
-            inner_data = json_wrapper.get("data")
-            if inner_data is None:
-                return ValidationResult(valid=True, data=None, warnings=["No inner data (wallet may have no activity)"])
-            
-            # Validate expected fields
-            if "total_pnl_usd" not in inner_data:
-                logger.api_alert("CIELO", "Missing 'total_pnl_usd' field in wallet stats")
-                warnings.append("Missing 'total_pnl_usd'")
-            
-            if "total_tokens_traded" not in inner_data:
-                logger.api_alert("CIELO", "Missing 'total_tokens_traded' field in wallet stats")
-                warnings.append("Missing 'total_tokens_traded'")
-            
-            return ValidationResult(valid=True, data=inner_data, warnings=warnings)
-            
-        except Exception as error:
-            logger.api_alert("CIELO", f"Unexpected error parsing response: {type(error).__name__}: {error}")
-            return ValidationResult(valid=False, error=f"Parse error: {error}")
+            inner_data = response["result"]["data"]["json"]["data"]
+        except (KeyError, TypeError, IndexError):
+            inner_data = None
+        
+        # Anything unusual goes through the schema walker for a precise alert
+        if type(inner_data) is not dict:
+            inner_data, failure = _CIELO_STATS_SCHEMA(response)
+            if failure is not None:
+                return failure
+        
+        # Validate expected fields
+        if "total_pnl_usd" not in inner_data:
+            get_logger().api_alert("CIELO", "Missing 'total_pnl_usd' field in wallet stats")
+            warnings.append("Missing 'total_pnl_usd'")
+        
+        if "total_tokens_traded" not in inner_data:
+            get_logger().api_alert("CIELO", "Missing 'total_tokens_traded' field in wallet stats")
+            warnings.append("Missing 'total_tokens_traded'")
+        
+        return ValidationResult(valid=True, data=inner_data, warnings=warnings)
     
     @staticmethod
     def extract_stats(response: Dict) -> Tuple[float, int, str, List[Dict]]:
@@ -264,29 +328,35 @@ class CieloValidator:
         Extract PnL, trades, and token list from Cielo response.
         Returns (pnl, trades, status, tokens) with proper error handling.
         """
-        validation = CieloValidator.validate_wallet_stats(response)
-        
+        return CieloValidator.extract_stats_validated(CieloValidator.validate_wallet_stats(response))
+    
+    @staticmethod
+    def extract_stats_validated(validation: ValidationResult) -> Tuple[float, int, str, List[Dict]]:
+        """
+        Extract stats from a result already returned by validate_wallet_stats().
+        Lets callers that validated the response themselves skip a second pass.
+        """
         if not validation.valid:
             return 0.0, 0, f"VALIDATION_ERROR: {validation.error}", []
         
         if validation.data is None:
             return 0.0, 0, "NO_DATA", []
         
+        return CieloValidator._extract_from_inner(validation.data, validation.warnings)
+    
+    @staticmethod
+    def _extract_from_inner(inner_data: Dict, warnings: List[str]) -> Tuple[float, int, str, List[Dict]]:
+        """Convert validated inner stats data into (pnl, trades, status, tokens)."""
         try:
-            # validation.data contains the inner_data from validate_wallet_stats
-            inner_data = validation.data
-            
-            pnl = float(inner_data.get("total_pnl_usd", 0) or 0)
-            trades = int(inner_data.get("total_tokens_traded", 0) or 0)
-            tokens = inner_data.get("tokens", [])
-            
-            # Fallback: check for 'items' key if 'tokens' is empty
-            if not tokens and "items" in inner_data:
-                tokens = inner_data["items"]
+            get = inner_data.get
+            pnl = float(get("total_pnl_usd", 0) or 0)
+            trades = int(get("total_tokens_traded", 0) or 0)
+            # Fallback: use 'items' if 'tokens' is empty
+            tokens = get("tokens") or get("items") or []
             
             status = "SUCCESS"
-            if validation.warnings:
-                status = f"SUCCESS_WITH_WARNINGS: {', '.join(validation.warnings)}"
+            if warnings:
+                status = f"SUCCESS_WITH_WARNINGS: {', '.join(warnings)}"
             
             return pnl, trades, status, tokens
             
@@ -299,82 +369,105 @@ class CieloValidator:
 # PRE-FLIGHT API CHECKS
 # ============================================================================
 
+# Rank preflight params (fresh client ids), rebuilt at most once per RANK_PARAMS_TTL seconds
+RANK_PARAMS_TTL = 60
+_rank_params_cache = {"params": None, "ts": 0.0}
+
+
+def _get_rank_params() -> dict:
+    """Return the GMGN rank preflight query params, reusing recent client ids."""
+    now = time.monotonic()
+    if _rank_params_cache["params"] is None or now - _rank_params_cache["ts"] > RANK_PARAMS_TTL:
+        day = datetime.now().strftime('%Y%m%d')
+        _rank_params_cache["params"] = {
+            "device_id": str(uuid.uuid4()),
+            "fp_did": secrets.token_hex(16),
+            "client_id": f"gmgn_web_{day}-{random.randint(1000, 9999)}-{secrets.token_hex(4)[:7]}",
+            "from_app": "gmgn",
+            "app_ver": f"{day}-{random.randint(1000, 9999)}-{secrets.token_hex(4)[:7]}",
+            "tz_name": "Europe/Rome",
+            "tz_offset": "3600",
+            "app_lang": "en-US",
+            "limit": "5",
+            "orderby": "swaps",
+            "direction": "desc"
+        }
+        _rank_params_cache["ts"] = now
+    return _rank_params_cache["params"]
+
+
+# Preflight failure messages for well-known HTTP statuses
+_STATUS_MSG = {
+    429: "Rate limited (429) - try again in a moment",
+    403: "Blocked (403) - check proxy configuration",
+}
+
+# GMGN preflight endpoints
+_GMGN_PREFLIGHT_TRADERS_URL = "https://gmgn.ai/vas/api/v1/token_traders/sol/So11111111111111111111111111111111111111112"
+_GMGN_PREFLIGHT_TRADERS_PARAMS = {"limit": 1, "orderby": "profit", "direction": "desc"}
+_GMGN_PREFLIGHT_RANK_URL = "https://gmgn.ai/api/v1/rank/sol/swaps/1h"
+
+# Cielo preflight request uses a known active wallet (from our own database); built once at import
+_CIELO_PREFLIGHT_WALLET = "13H846xTBgtimSPNu7sPVgySFJuPadbWti7ZedoBN7mE"
+_CIELO_PREFLIGHT_URL = "https://app.cielo.finance/api/trpc/profile.fetchTokenPnlFast?input=" + json.dumps({
+    "json": {
+        "wallet": _CIELO_PREFLIGHT_WALLET, 
+        "chains": "", 
+        "timeframe": "30d", 
+        "sortBy": "pnl_desc", 
+        "page": "1", 
+        "tokenFilter": ""
+    }
+})
+
+
+async def _do_preflight(session, proxy: Optional[str], name: str, url: str,
+                        params: Optional[dict], validator: Callable[[Any], ValidationResult]) -> Tuple[bool, str, bool]:
+    """
+    Fetch one preflight endpoint and validate its structure.
+    Returns (success, message, connection_error); the message is empty on success.
+    Proxy health is left to the caller, which reports once per preflight.
+    """
+    try:
+        response = await session.get(url, params=params, timeout=15, proxy=proxy)
+        
+        status = response.status_code
+        if status != 200:
+            return False, f"{name}: " + _STATUS_MSG.get(status, f"HTTP {status} - API may be down"), False
+        
+        validation = validator(parse_json(response))
+        if not validation.valid:
+            return False, f"{name} API structure changed: {validation.error}", False
+        
+    except Exception as e:
+        return False, f"{name} endpoint error: {type(e).__name__}: {e}", True
+    return True, "", False
+
+
 async def preflight_check_gmgn(session, proxy_manager) -> Tuple[bool, str]:
     """
     Test GMGN API before starting main processing.
-    Tests multiple endpoints: token_traders, token_holders, and rank.
+    Tests the token_traders and rank endpoints concurrently.
     Returns (success, message).
     """
-    from logger import get_logger
-    import uuid
-    import random
-    from datetime import datetime
-    logger = get_logger()
-    
     proxy = proxy_manager.get_proxy() if proxy_manager.enabled else None
     
-    # Test 1: Token Traders endpoint
-    test_token = "So11111111111111111111111111111111111111112"
-    url_traders = f"https://gmgn.ai/vas/api/v1/token_traders/sol/{test_token}"
-    params_traders = {"limit": 1, "orderby": "profit", "direction": "desc"}
+    results = await asyncio.gather(
+        _do_preflight(session, proxy, "Traders",
+                      _GMGN_PREFLIGHT_TRADERS_URL, _GMGN_PREFLIGHT_TRADERS_PARAMS,
+                      lambda data: GMGNValidator.validate_traders_response(data, "preflight")),
+        _do_preflight(session, proxy, "Rank",
+                      _GMGN_PREFLIGHT_RANK_URL, _get_rank_params(),
+                      GMGNValidator.validate_rank_response),
+    )
     
-    try:
-        response = await session.get(url_traders, params=params_traders, timeout=15, proxy=proxy)
-        
-        if response.status_code == 429:
-            return False, "Rate limited (429) - try again in a moment"
-        if response.status_code == 403:
-            return False, "Blocked (403) - check proxy configuration"
-        if response.status_code != 200:
-            return False, f"HTTP {response.status_code} - API may be down"
-        
-        data = response.json()
-        validation = GMGNValidator.validate_traders_response(data, "preflight")
-        
-        if not validation.valid:
-            return False, f"Traders API structure changed: {validation.error}"
-            
-    except Exception as e:
-        if proxy_manager.enabled and proxy:
-            proxy_manager.report_failure(proxy)
-        return False, f"Traders endpoint error: {type(e).__name__}: {e}"
-    
-    # Test 2: Rank endpoint (trending tokens)
-    url_rank = "https://gmgn.ai/api/v1/rank/sol/swaps/1h"
-    params_rank = {
-        "device_id": str(uuid.uuid4()),
-        "fp_did": uuid.uuid4().hex[:32],
-        "client_id": f"gmgn_web_{datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}-{uuid.uuid4().hex[:7]}",
-        "from_app": "gmgn",
-        "app_ver": f"{datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}-{uuid.uuid4().hex[:7]}",
-        "tz_name": "Europe/Rome",
-        "tz_offset": "3600",
-        "app_lang": "en-US",
-        "limit": "5",
-        "orderby": "swaps",
-        "direction": "desc"
-    }
+    # Both requests share the proxy: count a connection error against it once, not per endpoint
+    if proxy_manager.enabled and proxy and any(errored for _, _, errored in results):
+        proxy_manager.report_failure(proxy)
     
-    try:
-        response = await session.get(url_rank, params=params_rank, timeout=15, proxy=proxy)
-        
-        if response.status_code == 429:
-            return False, "Rank endpoint rate limited (429)"
-        if response.status_code == 403:
-            return False, "Rank endpoint blocked (403) - check proxy configuration"
-        if response.status_code != 200:
-            return False, f"Rank endpoint HTTP {response.status_code}"
-        
-        data = response.json()
-        validation = GMGNValidator.validate_rank_response(data)
-        
-        if not validation.valid:
-            return False, f"Rank API structure changed: {validation.error}"
-            
-    except Exception as e:
-        if proxy_manager.enabled and proxy:
-            proxy_manager.report_failure(proxy)
-        return False, f"Rank endpoint error: {type(e).__name__}: {e}"
+    for ok, msg, _ in results:
+        if not ok:
+            return False, msg
     
     # All tests passed
     if proxy_manager.enabled:
@@ -388,99 +481,75 @@ async def preflight_check_cielo(session, proxy_manager) -> Tuple[bool, str]:
     Makes a single request to verify API structure.
     Returns (success, message).
     """
-    import json as json_lib
-    from logger import get_logger
-    logger = get_logger()
-    
-    # Use a known active wallet for testing (from our own database)
-    test_wallet = "13H846xTBgtimSPNu7sPVgySFJuPadbWti7ZedoBN7mE"
-    
-    input_params = {
-        "json": {
-            "wallet": test_wallet, 
-            "chains": "", 
-            "timeframe": "30d", 
-            "sortBy": "pnl_desc", 
-            "page": "1", 
-            "tokenFilter": ""
-        }
-    }
-    url = f"https://app.cielo.finance/api/trpc/profile.fetchTokenPnlFast?input={json_lib.dumps(input_params)}"
-    
     proxy = proxy_manager.get_proxy() if proxy_manager.enabled else None
     
-    try:
-        response = await session.get(url, timeout=15, proxy=proxy)
-        
-        if response.status_code == 429:
-            return False, "Rate limited (429) - try again in a moment"
-        
-        if response.status_code == 403:
-            return False, "Blocked (403) - check proxy configuration"
-        
-        if response.status_code != 200:
-            return False, f"HTTP {response.status_code} - API may be down"
-        
-        data = response.json()
-        validation = CieloValidator.validate_wallet_stats(data)
-        
-        if validation.valid:
-            if proxy_manager.enabled:
-                proxy_manager.report_success(proxy)
-            return True, "Cielo API responding correctly ✓"
-        else:
-            return False, f"API structure changed: {validation.error}"
-            
-    except Exception as e:
-        if proxy_manager.enabled and proxy:
-            proxy_manager.report_failure(proxy)
-        return False, f"Connection error: {type(e).__name__}: {e}"
+    ok, msg, errored = await _do_preflight(session, proxy, "Cielo",
+                                           _CIELO_PREFLIGHT_URL, None, CieloValidator.validate_wallet_stats)
+    if errored and proxy_manager.enabled and proxy:
+        proxy_manager.report_failure(proxy)
+    if not ok:
+        return False, msg
+    
+    if proxy_manager.enabled:
+        proxy_manager.report_success(proxy)
+    return True, "Cielo API responding correctly ✓"
 
 
-async def warmup_proxies(session, proxy_manager, api_type: str = "cielo") -> dict:
-    """
-    Test all proxies in parallel to identify healthy ones.
-    Returns dict with healthy/unhealthy proxy lists.
-    """
-    import asyncio
-    from logger import get_logger
-    logger = get_logger()
-    
-    if not proxy_manager.enabled or not proxy_manager.proxies:
-        return {"healthy": [], "unhealthy": [], "total": 0}
-    
-    print(f"\n🔥 Warming up {len(proxy_manager.proxies)} proxies...")
-    
-    async def test_single_proxy(proxy_url: str, index: int) -> tuple:
-        """Test a single proxy and return (proxy, success, latency_ms, error)"""
-        import time
-        start = time.time()
-        
-        # Use appropriate test based on API type
-        if api_type == "cielo":
-            test_url = "https://app.cielo.finance/"
-        else:  # gmgn
-            test_url = "https://gmgn.ai/"
-        
+# Max proxies probed at once during warmup
+WARMUP_CONCURRENCY = 64
+
+# Monotonic high-resolution clock for probe latencies
+_pc = time.perf_counter
+
+
+async def _test_single_proxy(session, proxy_url: str, api_type: str, sem: asyncio.Semaphore) -> tuple:
+    """Test a single proxy and return (proxy, success, latency_ms, error)"""
+    # Use appropriate test based on API type
+    if api_type == "cielo":
+        test_url = "https://app.cielo.finance/"
+    else:  # gmgn
+        test_url = "https://gmgn.ai/"
+    
+    async with sem:
+        start = _pc()
         try:
             response = await session.get(test_url, timeout=10, proxy=proxy_url)
-            latency = (time.time() - start) * 1000  # Convert to ms
+            latency = (_pc() - start) * 1000  # Convert to ms
             
             if response.status_code in [200, 307, 301, 302]:  # Accept redirects
                 return (proxy_url, True, latency, None)
             else:
                 return (proxy_url, False, latency, f"HTTP {response.status_code}")
         except Exception as e:
-            latency = (time.time() - start) * 1000
+            latency = (_pc() - start) * 1000
             error_msg = f"{type(e).__name__}"
             if "timeout" in str(e).lower():
                 error_msg = "Timeout"
             elif "connection" in str(e).lower():
                 error_msg = "Connection failed"
             return (proxy_url, False, latency, error_msg)
+
+
+async def warmup_proxies(session, proxy_manager, api_type: str = "cielo") -> dict:
+    """
+    Test all proxies in parallel to identify healthy ones.
+    Returns dict with healthy/unhealthy proxy lists.
+    """
+    proxies = proxy_manager.proxies
+    if not proxy_manager.enabled or not proxies:
+        return {"healthy": [], "unhealthy": [], "total": 0}
     
-    # Test all proxies in parallel
-    tasks = [test_single_proxy(proxy, i) for i, proxy in enumerate(proxy_manager.proxies)]
+    total = len(proxies)
+    print(f"\n🔥 Warming up {total} proxies...")
+    
+    # Mask proxies for display once, up front
+    masks = {proxy: proxy_manager._mask_proxy(proxy) for proxy in proxies}
+    
+    # Bound in-flight probes so large pools don't exhaust sockets
+    sem = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    
+    # Test all proxies in parallel (bounded by the semaphore)
+    tasks = [_test_single_proxy(session, proxy, api_type, sem) for proxy in proxies]
     results = await asyncio.gather(*tasks)
     
     # Categorize results
@@ -488,24 +557,21 @@ async def warmup_proxies(session, proxy_manager, api_type: str = "cielo") -> dic
     unhealthy = []
     
     for proxy_url, success, latency, error in results:
-        # Mask proxy for display
-        masked = proxy_manager._mask_proxy(proxy_url)
+        masked = masks[proxy_url]
         
         if success:
             healthy.append((proxy_url, latency))
-            status = f"✅ {masked}: {latency:.0f}ms"
-            print(f"   {status}")
+            print(f"   ✅ {masked}: {latency:.0f}ms")
         else:
             unhealthy.append((proxy_url, error))
-            status = f"❌ {masked}: {error}"
-            print(f"   {status}")
+            print(f"   ❌ {masked}: {error}")
     
-    print(f"\n📊 Proxy Health: {len(healthy)}/{len(proxy_manager.proxies)} healthy")
+    print(f"\n📊 Proxy Health: {len(healthy)}/{total} healthy")
     
     return {
         "healthy": healthy,
         "unhealthy": unhealthy,
-        "total": len(proxy_manager.proxies)
+        "total": total
     }
 
 
@@ -514,9 +580,6 @@ async def run_preflight_checks(session, proxy_manager, check_gmgn: bool = True,
     Run pre-flight checks for specified APIs with proxy warmup.
     Returns True if all checks pass, False otherwise.
     """
-    from logger import get_logger
-    logger = get_logger()
-    
     print("\n" + "=" * 60)
     print("🔍 PRE-FLIGHT CHECK")
     print("=" * 60)
@@ -549,17 +612,17 @@ async def run_preflight_checks(session, proxy_manager, check_gmgn: bool = True,
     print("\n🧪 Testing API endpoints...")
     all_passed = True
     
+    # Run the selected API checks concurrently, then report in a fixed order
+    checks = []
     if check_gmgn:
-        print("   GMGN API...", end=" ", flush=True)
-        success, message = await preflight_check_gmgn(session, proxy_manager)
-        print(f"{'✅' if success else '❌'} {message}")
-        if not success:
-            all_passed = False
-    
+        checks.append(("GMGN API", preflight_check_gmgn(session, proxy_manager)))
     if check_cielo:
-        print("   Cielo API...", end=" ", flush=True)
-        success, message = await preflight_check_cielo(session, proxy_manager)
-        print(f"{'✅' if success else '❌'} {message}")
+        checks.append(("Cielo API", preflight_check_cielo(session, proxy_manager)))
+    
+    results = await asyncio.gather(*(coro for _, coro in checks))
+    
+    for (name, _), (success, message) in zip(checks, results):
+        print(f"   {name}... {'✅' if success else '❌'} {message}")
         if not success:
             all_passed = False
     
@@ -576,7 +639,7 @@ async def run_preflight_checks(session, proxy_manager, check_gmgn: bool = True,
             response = input("   Continue anyway? [y/N]: ").strip().lower()
             if response in ('y', 'yes'):
                 print("   Proceeding despite failed checks...\n")
-                logger.warning("User chose to proceed despite failed preflight checks")
+                get_logger().warning("User chose to proceed despite failed preflight checks")
                 return True
             else:
                 print("   Aborting. Fix the issues and try again.\n")
@@ -2,19 +2,252 @@
 Base API Client - Shared HTTP logic with proxy rotation and retry handling
 
 Provides a reusable foundation for API clients that need:
-- Proxy rotation with health tracking
-- Retry logic with exponential backoff
-- Rate limit handling
-- Request semaphore for concurrency control
+- Proxy rotation with health tracking and per-proxy connection reuse
+- Retry logic with exponential backoff and full jitter
+- Rate limit handling (honors Retry-After)
+- Circuit breaker to stop retrying during outages
+- Adaptive request limiter for concurrency control
+- Token-bucket request rate shaping
 - Consistent error handling
 """
 
+import array
 import asyncio
+import itertools
 import random
-from typing import Optional, Dict, Any, Callable
+import socket
+import time
+from types import MappingProxyType
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable, AsyncIterator, Iterable, Mapping, Tuple
+from curl_cffi import CurlOpt
 from curl_cffi.requests import AsyncSession
 from proxy_manager import ProxyManager
 from logger import get_logger
+from api_validators import parse_json
+from config import CFG
+
+# OS-entropy RNG so concurrent processes don't draw correlated retry delays
+_rng = random.SystemRandom()
+
+# Pre-request jitter: a table of uniform [0, 1) values cycled per request and scaled to
+# each call's delay_range, instead of drawing a fresh random number every time
+_JITTER_MASK = (1 << 14) - 1
+_JITTER = array.array('d', (_rng.random() for _ in range(_JITTER_MASK + 1)))
+_jitter_index = itertools.count(_rng.randrange(_JITTER_MASK + 1))
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter whose limit can change at runtime (AIMD-style).
+    
+    asyncio.Semaphore's counter can't be resized safely, so this keeps an explicit
+    active count under an asyncio.Condition. Used as `async with limiter:`.
+    The limit shrinks by one on each rate limit and grows back by one after
+    `increase_after` consecutive successes, never exceeding the initial ceiling.
+    """
+    
+    def __init__(self, limit: int, increase_after: int = 20):
+        self.ceiling = limit
+        self.limit = limit
+        self.increase_after = increase_after
+        self._active = 0
+        self._success_streak = 0
+        self._cond = asyncio.Condition()
+    
+    @property
+    def active(self) -> int:
+        return self._active
+    
+    async def acquire(self):
+        async with self._cond:
+            try:
+                await self._cond.wait_for(lambda: self._active < self.limit)
+            except asyncio.CancelledError:
+                # A cancelled waiter may have consumed the wakeup meant for a free slot;
+                # pass it on (asyncio.Condition only does this itself from Python 3.13)
+                if self._active < self.limit:
+                    self._cond.notify(1)
+                raise
+            self._active += 1
+    
+    async def release(self):
+        # Same guard as asyncio.BoundedSemaphore: an extra release would silently raise concurrency
+        if self._active <= 0:
+            raise ValueError("AdaptiveLimiter released too many times")
+        # Give the slot back before awaiting anything: a task cancelled while waiting for the
+        # lock (get_many cancels its pending fetches) would otherwise hold the slot forever
+        self._active -= 1
+        # Shielded so cancelling the releasing task can't drop the wakeup for a waiter
+        await asyncio.shield(self._notify_one())
+    
+    async def _notify_one(self):
+        async with self._cond:
+            self._cond.notify(1)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+    
+    async def set_limit(self, limit: int):
+        """Set the concurrency limit (clamped to 1..ceiling) and wake waiters."""
+        async with self._cond:
+            self.limit = max(1, min(limit, self.ceiling))
+            self._cond.notify_all()
+    
+    async def on_rate_limit(self):
+        """Additive decrease after a 429/503."""
+        self._success_streak = 0
+        if self.limit > 1:
+            await self.set_limit(self.limit - 1)
+    
+    async def on_success(self):
+        """Additive increase after a streak of successes."""
+        self._success_streak += 1
+        if self._success_streak >= self.increase_after and self.limit < self.ceiling:
+            self._success_streak = 0
+            await self.set_limit(self.limit + 1)
+
+
+class TokenBucket:
+    """
+    Client-side request rate shaper, so we slow down before the API starts returning 429s.
+    
+    Holds up to `capacity` tokens refilled at `rate` per second; each request takes one.
+    The rate backs off multiplicatively on 429/503 and recovers additively after
+    `increase_after` consecutive successes, never exceeding the initial rate.
+    """
+    
+    def __init__(self, rate: float, capacity: float, increase_after: int = 20,
+                 decrease_factor: float = 0.7, increase_step: float = 0.5, min_rate: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.increase_after = increase_after
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate = min(min_rate, rate)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._success_streak = 0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+    
+    async def acquire(self):
+        """Take one token, sleeping until one is available."""
+        # Lock serializes waiters so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+    
+    def on_rate_limit(self):
+        """Multiplicative decrease after a 429/503."""
+        self._success_streak = 0
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+    
+    def on_success(self):
+        """Additive increase after a streak of successes."""
+        self._success_streak += 1
+        if self._success_streak >= self.increase_after and self.rate < self.max_rate:
+            self._success_streak = 0
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests while the whole route to the API is failing.
+    
+    With a proxy pool, the circuit opens when a failure leaves no usable proxy
+    (every proxy cooling down); a healthy pool keeps it closed however many
+    individual requests fail. Without a pool, it opens after `threshold`
+    consecutive hard failures (connection errors, 403, 5xx) - rate limits and
+    bad bodies don't count. While open, requests wait instead of sending; after
+    `open_duration` seconds a single probe goes through (half-open): a success
+    closes the circuit, a failure re-opens it.
+    """
+    
+    CLOSED = "CLOSED"        # Normal operation
+    OPEN = "OPEN"            # Blocking all requests
+    HALF_OPEN = "HALF_OPEN"  # Testing if service recovered
+    
+    PROBE_POLL_INTERVAL = 1.0  # seconds between checks while a half-open probe is in flight
+    
+    def __init__(self, threshold: int, open_duration: float,
+                 pool_exhausted: Optional[Callable[[], bool]] = None):
+        self.threshold = threshold
+        self.open_duration = open_duration
+        self.pool_exhausted = pool_exhausted
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._probe_started = 0.0
+    
+    def is_open(self) -> bool:
+        """True if a request should be held back right now."""
+        if self.state == self.CLOSED:
+            return False
+        
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.open_duration:
+                return True
+            self.state = self.HALF_OPEN
+            self._probe_started = now
+            get_logger().info("Circuit half-open: testing recovery with next request")
+            return False
+        
+        # HALF_OPEN: one probe at a time (a lost probe is replaced after open_duration)
+        if now - self._probe_started < self.open_duration:
+            return True
+        self._probe_started = now
+        return False
+    
+    async def wait_until_allowed(self, deadline: float) -> bool:
+        """Sleep while the circuit is open; False if `deadline` (monotonic) passes first."""
+        while self.is_open():
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            if self.state == self.OPEN:
+                delay = self.opened_at + self.open_duration - now
+            else:
+                delay = self.PROBE_POLL_INTERVAL
+            await asyncio.sleep(max(0.05, min(delay, deadline - now)))
+        return True
+    
+    def record_success(self):
+        self.failure_count = 0
+        if self.state != self.CLOSED:
+            self.state = self.CLOSED
+            get_logger().info("Circuit closed: service recovered, resuming normal operation")
+    
+    def record_failure(self, hard: bool = True):
+        """Count a failed attempt; `hard` is False for rate limits and unparseable bodies."""
+        if self.pool_exhausted is not None:
+            tripped = self.pool_exhausted()
+            reason = "no usable proxies"
+        else:
+            if hard:
+                self.failure_count += 1
+            tripped = self.failure_count >= self.threshold
+            reason = f"{self.failure_count} consecutive failures"
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and tripped):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            get_logger().warning(f"Circuit breaker open ({reason}); retrying in {self.open_duration}s")
 
 
 class BaseAPIClient:
@@ -23,9 +256,11 @@ class BaseAPIClient:
     
     Features:
     - Automatic proxy rotation on failures
-    - Exponential backoff for retries
-    - Rate limit handling (429)
-    - Request concurrency control via semaphore
+    - Exponential backoff with full jitter for retries
+    - Rate limit handling (429/503, honors Retry-After)
+    - Request concurrency control via an adaptive limiter (shrinks on 429s)
+    - Request rate shaping via an adaptive token bucket
+    - Circuit breaker shared by all requests from this client
     - Consistent success/failure reporting
     
     Subclasses should implement:
@@ -34,17 +269,34 @@ class BaseAPIClient:
     """
     
     # Default retry configuration
-    DEFAULT_MAX_RETRIES = 3
     DEFAULT_TIMEOUT = 30
-    DEFAULT_RATE_LIMIT_BACKOFF = 3  # seconds per attempt
-    DEFAULT_ERROR_BACKOFF = 1  # seconds
+    DEFAULT_TOTAL_TIMEOUT = 120  # wall-clock budget per request, across all retries and backoffs
+    DEFAULT_RATE_LIMIT_BACKOFF = 3  # base seconds, doubled per attempt when no Retry-After
+    DEFAULT_FORBIDDEN_BACKOFF = 5  # base seconds for 403
+    DEFAULT_MAX_BACKOFF = 60  # cap for any backoff wait, including Retry-After
+    DEFAULT_ERROR_BACKOFF = 1  # base seconds for other errors
+    DEFAULT_REQUESTS_PER_SECOND = 10.0  # token bucket starting/maximum rate
+    DEFAULT_SESSION_IDLE_TIMEOUT = 300  # close per-proxy sessions unused for this long (seconds)
+    
+    # Shared read-only error result, returned on every failure instead of a fresh dict
+    _ERROR_RESPONSE = MappingProxyType({"code": -1, "data": MappingProxyType({})})
+    
+    # HTTP method -> session coroutine name
+    _SEND_METHODS = {'GET': 'get', 'POST': 'post'}
+    
+    # API hosts resolved when the client starts, so the first burst doesn't queue on DNS
+    # (set by subclasses for the hosts they call; empty disables the warm-up)
+    DNS_WARM_HOSTS: Tuple[str, ...] = ()
+    DNS_REFRESH_INTERVAL = 60  # seconds between re-resolving pinned hosts (curl's own DNS cache TTL)
     
     def __init__(
         self, 
         session: AsyncSession, 
         proxy_manager: ProxyManager,
         max_concurrent_requests: int = 10,
-        max_retries: int = DEFAULT_MAX_RETRIES
+        max_retries: int = CFG.max_retries,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        per_proxy_sessions: bool = True
     ):
         """
         Initialize the base API client.
@@ -52,14 +304,36 @@ class BaseAPIClient:
         Args:
             session: curl_cffi AsyncSession for making requests
             proxy_manager: ProxyManager for proxy rotation
-            max_concurrent_requests: Maximum concurrent requests (semaphore limit)
-            max_retries: Maximum retry attempts per request
+            max_concurrent_requests: Maximum concurrent requests (limiter ceiling)
+            max_retries: Maximum retry attempts per request (defaults to MAX_RETRIES from config)
+            requests_per_second: Starting (and maximum) request rate for the token bucket
+            per_proxy_sessions: Keep one long-lived session per proxy so its TLS/CONNECT
+                tunnels are reused; they copy the base session's headers and impersonation
         """
         self.session = session
         self.proxy_manager = proxy_manager
-        self.request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.request_semaphore = AdaptiveLimiter(max_concurrent_requests)
+        self.rate_limiter = TokenBucket(requests_per_second, capacity=max_concurrent_requests)
+        # With proxies the breaker watches the pool itself; without, consecutive hard failures
+        use_pool = bool(proxy_manager and proxy_manager.enabled)
+        self.circuit_breaker = CircuitBreaker(
+            CFG.circuit_breaker_threshold_no_proxies,
+            CFG.circuit_open_duration,
+            pool_exhausted=(lambda: not proxy_manager.has_usable_proxy()) if use_pool else None
+        )
+        self.per_proxy_sessions = per_proxy_sessions
+        self._max_connections = max_concurrent_requests
+        self._proxy_sessions: Dict[str, AsyncSession] = {}
+        self._session_last_used: Dict[str, float] = {}
+        self._last_idle_sweep = time.monotonic()
         self.max_retries = max_retries
         self.logger = get_logger()
+        self._dns_task = None
+        if self.DNS_WARM_HOSTS:
+            try:
+                self._dns_task = asyncio.get_running_loop().create_task(self._warm_dns())
+            except RuntimeError:
+                pass  # constructed outside an event loop
     
     async def _request_with_retry(
         self,
@@ -70,8 +344,9 @@ class BaseAPIClient:
         json_data: Optional[Dict] = None,
         timeout: int = DEFAULT_TIMEOUT,
         validator: Optional[Callable] = None,
-        delay_range: tuple = (0.3, 0.8)
-    ) -> Dict[str, Any]:
+        delay_range: tuple = (0.3, 0.8),
+        total_timeout_s: float = DEFAULT_TOTAL_TIMEOUT
+    ) -> Mapping[str, Any]:
         """
         Make an HTTP request with automatic retry and proxy rotation.
         
@@ -84,88 +359,262 @@ class BaseAPIClient:
             timeout: Request timeout in seconds
             validator: Optional validation function (response_data) -> ValidationResult
             delay_range: Random delay range (min, max) in seconds before each request
+            total_timeout_s: Overall deadline in seconds; the request is abandoned once it passes
         
         Returns:
-            Response data dict, or error dict with {"code": -1, "data": {}}
+            Response data dict, or the read-only error mapping {"code": -1, "data": {}}
         """
         
-        for attempt in range(self.max_retries):
-            # Get a fresh proxy for each attempt (allows failover)
-            current_proxy = self.proxy_manager.get_proxy()
+        # Bind hot attributes once; they are used on every attempt
+        method = method.upper()
+        send_name = self._SEND_METHODS.get(method)
+        if send_name is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        body = {'json': json_data} if method == 'POST' else {}
+        
+        proxy_manager = self.proxy_manager
+        limiter = self.request_semaphore
+        rate_limiter = self.rate_limiter
+        logger = self.logger
+        compute_backoff = self._compute_backoff
+        breaker = self.circuit_breaker
+        max_retries = self.max_retries
+        forbidden_backoff = self.DEFAULT_FORBIDDEN_BACKOFF
+        error_backoff = self.DEFAULT_ERROR_BACKOFF
+        deadline = time.monotonic() + total_timeout_s
+        
+        current_proxy = None
+        
+        for attempt in range(max_retries):
+            if time.monotonic() >= deadline:
+                return self._abandon(endpoint_name, total_timeout_s)
+            
+            # Hold off while the circuit is open instead of burning retries
+            if breaker.is_open():
+                logger.debug("Circuit open, waiting to send %s", endpoint_name)
+                if not await breaker.wait_until_allowed(deadline):
+                    return self._abandon(endpoint_name, total_timeout_s)
+            
+            # Get a fresh proxy for each attempt (allows failover); retries prefer
+            # proxies with a good track record and never reuse the one that just failed
+            if attempt == 0:
+                current_proxy = proxy_manager.get_proxy()
+            else:
+                current_proxy = proxy_manager.get_proxy(strategy="weighted", exclude=(current_proxy,))
+            wait = 0
             
-            async with self.request_semaphore:
+            # Random jitter to avoid thundering herd (before taking a slot, so it doesn't idle one)
+            low, high = delay_range
+            await asyncio.sleep(low + _JITTER[next(_jitter_index) & _JITTER_MASK] * (high - low))
+            
+            # Shape the request rate before competing for a concurrency slot
+            await rate_limiter.acquire()
+            
+            async with limiter:
                 try:
-                    # Random jitter to avoid thundering herd
-                    await asyncio.sleep(random.uniform(*delay_range))
+                    # Make the request (on this proxy's own session, so its connections are reused)
+                    send = getattr(await self._session_for(current_proxy), send_name)
+                    response = await send(
+                        url,
+                        params=params,
+                        timeout=max(0.1, min(timeout, deadline - time.monotonic())),
+                        proxy=current_proxy,
+                        **body
+                    )
+                    status = response.status_code
                     
-                    # Make the request
-                    if method.upper() == 'GET':
-                        response = await self.session.get(
-                            url,
-                            params=params,
-                            timeout=timeout,
-                            proxy=current_proxy
-                        )
-                    elif method.upper() == 'POST':
-                        response = await self.session.post(
-                            url,
-                            params=params,
-                            json=json_data,
-                            timeout=timeout,
-                            proxy=current_proxy
-                        )
-                    else:
-                        raise ValueError(f"Unsupported HTTP method: {method}")
-                    
-                    # Handle rate limiting (429)
-                    if response.status_code == 429:
-                        self.proxy_manager.report_failure(current_proxy, is_rate_limit=True)
-                        wait = (attempt + 1) * self.DEFAULT_RATE_LIMIT_BACKOFF
-                        self.logger.debug(f"Rate limit on {endpoint_name}, rotating proxy ({wait}s)")
-                        await asyncio.sleep(wait)
-                        continue
+                    # Handle rate limiting (429) and overload (503)
+                    if status == 429 or status == 503:
+                        proxy_manager.report_failure(current_proxy, is_rate_limit=status == 429)
+                        breaker.record_failure(hard=status == 503)
+                        await limiter.on_rate_limit()
+                        rate_limiter.on_rate_limit()
+                        wait = self._rate_limit_wait(response, attempt)
+                        logger.debug("HTTP %s on %s, rotating proxy (%.1fs)", status, endpoint_name, wait)
                     
                     # Handle forbidden (403) - often means proxy is blocked
-                    if response.status_code == 403:
-                        self.proxy_manager.report_failure(current_proxy)
-                        wait = (attempt + 1) * 5
-                        self.logger.debug(f"Forbidden (403) on {endpoint_name}, rotating proxy ({wait}s)")
-                        await asyncio.sleep(wait)
-                        continue
+                    elif status == 403:
+                        proxy_manager.report_failure(current_proxy)
+                        breaker.record_failure()
+                        wait = compute_backoff(attempt, forbidden_backoff)
+                        logger.debug("Forbidden (403) on %s, rotating proxy (%.1fs)", endpoint_name, wait)
                     
                     # Handle success (200)
-                    if response.status_code == 200:
-                        response_data = response.json()
-                        
-                        # Validate response if validator provided
-                        if validator:
-                            validation = validator(response_data)
+                    elif status == 200:
+                        await limiter.on_success()
+                        rate_limiter.on_success()
+                        try:
+                            response_data = parse_json(response)
+                        except ValueError as error:
+                            # Truncated/garbled body: retry, but the connection itself is fine
+                            proxy_manager.report_failure(current_proxy)
+                            breaker.record_failure(hard=False)
+                            logger.debug("Invalid JSON from %s: %s, retrying...", endpoint_name, error)
+                            wait = compute_backoff(attempt, error_backoff)
+                        else:
+                            breaker.record_success()
                             
-                            if validation.valid:
-                                self.proxy_manager.report_success(current_proxy)
-                                return self._format_success_response(validation.data)
+                            # Validate response if validator provided
+                            if validator:
+                                validation = validator(response_data)
+                                
+                                if validation.valid:
+                                    proxy_manager.report_success(current_proxy)
+                                    return self._format_success_response(validation.data)
+                                else:
+                                    logger.warning("%s validation failed: %s", endpoint_name, validation.error)
+                                    return self._format_error_response()
                             else:
-                                self.logger.warning(f"{endpoint_name} validation failed: {validation.error}")
-                                return self._format_error_response()
-                        else:
-                            # No validation - return raw data
-                            self.proxy_manager.report_success(current_proxy)
-                            return response_data
+                                # No validation - return raw data
+                                proxy_manager.report_success(current_proxy)
+                                return response_data
                     
                     # Other non-200 status codes
-                    self.proxy_manager.report_failure(current_proxy)
-                    self.logger.debug(f"HTTP {response.status_code} on {endpoint_name}, retrying...")
-                    await asyncio.sleep(self.DEFAULT_ERROR_BACKOFF)
+                    else:
+                        proxy_manager.report_failure(current_proxy)
+                        breaker.record_failure()
+                        logger.debug("HTTP %s on %s, retrying...", status, endpoint_name)
+                        wait = compute_backoff(attempt, error_backoff)
                     
                 except Exception as error:
-                    self.proxy_manager.report_failure(current_proxy)
-                    self.logger.error(f"Connection error for {endpoint_name}: {type(error).__name__}: {error}")
-                    await asyncio.sleep(self.DEFAULT_ERROR_BACKOFF)
+                    proxy_manager.report_failure(current_proxy)
+                    breaker.record_failure()
+                    # The proxy's pooled connections may be dead; start fresh next time
+                    await self._drop_session(current_proxy)
+                    logger.error("Connection error for %s: %s: %s", endpoint_name, type(error).__name__, error)
+                    wait = compute_backoff(attempt, error_backoff)
+            
+            # Back off outside the limiter so waiting doesn't hold a request slot
+            if wait:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (wait >= remaining and attempt + 1 < max_retries):
+                    return self._abandon(endpoint_name, total_timeout_s)
+                await asyncio.sleep(min(wait, remaining))
         
         # All retries exhausted
-        self.logger.error(f"All {self.max_retries} retries exhausted for {endpoint_name}")
+        logger.error("All %d retries exhausted for %s", max_retries, endpoint_name)
+        return self._format_error_response()
+    
+    async def _session_for(self, proxy: Optional[str]) -> AsyncSession:
+        """Return the long-lived session for a proxy, creating it on first use."""
+        if not self.per_proxy_sessions or not proxy:
+            return self.session
+        
+        now = time.monotonic()
+        if now - self._last_idle_sweep >= self.DEFAULT_SESSION_IDLE_TIMEOUT:
+            self._last_idle_sweep = now
+            await self.close_idle_sessions()
+        
+        session = self._proxy_sessions.get(proxy)
+        if session is None:
+            session = AsyncSession(
+                impersonate=self.session.impersonate,
+                headers=dict(self.session.headers),
+                max_clients=self._max_connections
+            )
+            self._proxy_sessions[proxy] = session
+        self._session_last_used[proxy] = now
+        return session
+    
+    async def _drop_session(self, proxy: Optional[str]):
+        """Close and forget a proxy's session (e.g. after a connection error)."""
+        session = self._proxy_sessions.pop(proxy, None)
+        self._session_last_used.pop(proxy, None)
+        if session is not None:
+            try:
+                await session.close()
+            except Exception:
+                pass
+    
+    async def close_idle_sessions(self, max_idle: Optional[float] = None):
+        """Close per-proxy sessions that haven't been used for max_idle seconds."""
+        if max_idle is None:
+            max_idle = self.DEFAULT_SESSION_IDLE_TIMEOUT
+        cutoff = time.monotonic() - max_idle
+        for proxy in [p for p, used in self._session_last_used.items() if used < cutoff]:
+            await self._drop_session(proxy)
+    
+    async def _warm_dns(self):
+        """
+        Resolve DNS_WARM_HOSTS and pin the addresses on the base session (CURLOPT_RESOLVE),
+        re-resolving every DNS_REFRESH_INTERVAL so a CDN address change is picked up.
+        
+        All addresses of one family are pinned (IPv4 when there are any), so curl can
+        still fall back between them. Only direct requests benefit: through a proxy the
+        CONNECT target is resolved by the proxy itself. A host that fails to resolve
+        is left to curl's normal lookup.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            results = await asyncio.gather(
+                *(loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM) for host in self.DNS_WARM_HOSTS),
+                return_exceptions=True
+            )
+            pins = {}
+            for host, infos in zip(self.DNS_WARM_HOSTS, results):
+                if isinstance(infos, BaseException) or not infos:
+                    self.logger.debug("DNS warm-up failed for %s: %s", host, infos)
+                    continue
+                family = socket.AF_INET if any(info[0] == socket.AF_INET for info in infos) else infos[0][0]
+                ips = dict.fromkeys(info[4][0] for info in infos if info[0] == family)
+                pins[f"{host}:443:"] = ",".join(f"[{ip}]" if ":" in ip else ip for ip in ips)
+            
+            curl_options = getattr(self.session, "curl_options", None)
+            if not isinstance(curl_options, dict):
+                return  # nowhere to pin; curl resolves on its own
+            if pins:
+                # Replace earlier pins for the same host:port instead of stacking them
+                prefixes = tuple(pins)
+                kept = [e for e in curl_options.get(CurlOpt.RESOLVE, ()) if not e.startswith(prefixes)]
+                curl_options[CurlOpt.RESOLVE] = kept + [prefix + addrs for prefix, addrs in pins.items()]
+            
+            await asyncio.sleep(self.DNS_REFRESH_INTERVAL)
+    
+    async def close(self):
+        """Close all per-proxy sessions. The base session belongs to the caller."""
+        if self._dns_task is not None and not self._dns_task.done():
+            self._dns_task.cancel()
+        for proxy in list(self._proxy_sessions):
+            await self._drop_session(proxy)
+    
+    def _abandon(self, endpoint_name: str, total_timeout_s: float) -> Mapping[str, Any]:
+        """Give up on a request whose overall deadline has passed."""
+        self.logger.error("Abandoned %s after %.0fs deadline", endpoint_name, total_timeout_s)
         return self._format_error_response()
     
+    def _rate_limit_wait(self, response, attempt: int) -> float:
+        """
+        Seconds to wait after a 429/503.
+        Uses the server's Retry-After (delta-seconds or HTTP-date) when present,
+        otherwise jittered exponential backoff. Always capped at DEFAULT_MAX_BACKOFF.
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            retry_after = retry_after.strip()
+            try:
+                return min(max(float(retry_after), 0.0), self.DEFAULT_MAX_BACKOFF)
+            except ValueError:
+                pass
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                delta = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                return min(max(delta, 0.0), self.DEFAULT_MAX_BACKOFF)
+            except (TypeError, ValueError):
+                pass
+        
+        return self._compute_backoff(attempt, self.DEFAULT_RATE_LIMIT_BACKOFF)
+    
+    def _compute_backoff(self, attempt: int, base: float, cap: Optional[float] = None) -> float:
+        """
+        Exponential backoff with full jitter: uniform(0, min(cap, base * 2**attempt)).
+        Spreads retries from concurrent tasks so they don't hit the API in lockstep.
+        """
+        if cap is None:
+            cap = self.DEFAULT_MAX_BACKOFF
+        return _rng.uniform(0, min(cap, base * 2 ** attempt))
+    
     def _format_success_response(self, data: Any) -> Dict[str, Any]:
         """
         Format a successful response.
@@ -173,12 +622,13 @@ class BaseAPIClient:
         """
         return {"code": 0, "data": data}
     
-    def _format_error_response(self) -> Dict[str, Any]:
+    def _format_error_response(self) -> Mapping[str, Any]:
         """
         Format an error response.
+        Returns a shared read-only mapping; copy it with dict() if you need to modify it.
         Subclasses can override for custom formatting.
         """
-        return {"code": -1, "data": {}}
+        return self._ERROR_RESPONSE
     
     async def get(
         self,
@@ -187,7 +637,7 @@ class BaseAPIClient:
         params: Optional[Dict] = None,
         validator: Optional[Callable] = None,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Convenience method for GET requests."""
         return await self._request_with_retry(
             method='GET',
@@ -198,6 +648,50 @@ class BaseAPIClient:
             **kwargs
         )
     
+    async def get_many(
+        self,
+        requests: Iterable[Tuple[str, str, Optional[Dict]]],
+        validator: Optional[Callable] = None,
+        **kwargs
+    ) -> AsyncIterator[Tuple[int, Mapping[str, Any]]]:
+        """
+        Run many GET requests and yield (index, response) as each one completes.
+        
+        requests is an iterable of (url, endpoint_name, params); index is its position.
+        At most 2x max_concurrent_requests are in flight or pending at once, so
+        huge (or lazily generated) batches don't create every coroutine up front.
+        """
+        window = self.request_semaphore.ceiling * 2
+        pending = {}
+        source = iter(enumerate(requests))
+        
+        def fill():
+            for index, (url, endpoint_name, params) in source:
+                task = asyncio.create_task(self._request_with_retry(
+                    method='GET',
+                    url=url,
+                    endpoint_name=endpoint_name,
+                    params=params,
+                    validator=validator,
+                    **kwargs
+                ))
+                pending[task] = index
+                if len(pending) >= window:
+                    return
+        
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    yield index, task.result()
+                fill()
+        finally:
+            # Consumer stopped early (or errored): don't leave requests running
+            for task in pending:
+                task.cancel()
+    
     async def post(
         self,
         url: str,
@@ -206,7 +700,7 @@ class BaseAPIClient:
         json_data: Optional[Dict] = None,
         validator: Optional[Callable] = None,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Convenience method for POST requests."""
         return await self._request_with_retry(
             method='POST',
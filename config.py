@@ -4,7 +4,11 @@ All paths and settings in one place, with environment variable overrides.
 """
 
 import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import FrozenSet, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -61,6 +65,7 @@ CIELO_API_URL = f"{CIELO_BASE_URL}/api/trpc/profile.fetchTokenPnlFast"
 API_DELAY = float(os.getenv("API_DELAY", "0.5"))
 MAX_CONCURRENT_TOKENS = int(os.getenv("MAX_CONCURRENT_TOKENS", "10"))
 MAX_GLOBAL_REQUESTS = int(os.getenv("MAX_GLOBAL_REQUESTS", "20"))
+GMGN_REQUESTS_PER_SECOND = float(os.getenv("GMGN_REQUESTS_PER_SECOND", "10.0"))  # Adaptive ceiling
 
 # Wallet-stats settings (Cielo - Lenient)
 MAX_CONCURRENT_WALLET_CHECKS = int(os.getenv("MAX_CONCURRENT_WALLET_CHECKS", "15"))
@@ -116,15 +121,42 @@ AUDIT_INTERVAL_HOURS = int(os.getenv("AUDIT_INTERVAL_HOURS", "2160")) # 90 days
 
 # Add token addresses here that you want to crawl manually
 # Now read from manual_tokens.txt for scalability
+def _read_address_file(path: Path) -> set:
+    """Read one address per line, skipping blanks and # comments."""
+    if not path.exists():
+        return set()
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    return {line for line in map(str.strip, text.splitlines()) if line and not line.startswith("#")}
+
+
+def _file_mtime(path: Path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
 def _load_manual_tokens():
-    tokens = []
-    if MANUAL_TOKENS_PATH.exists():
-        with open(MANUAL_TOKENS_PATH, "r") as f:
-            tokens = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
-    return list(set(tokens))
+    return list(_read_address_file(MANUAL_TOKENS_PATH))
 
 MANUAL_TOKENS = _load_manual_tokens()
 
+# In-memory view of manual_tokens.txt, re-read only when the file's mtime changes
+_manual_cache = {"mtime": _file_mtime(MANUAL_TOKENS_PATH), "tokens": set(MANUAL_TOKENS)}
+
+# ============================================================================
+# DATABASE TUNING
+# ============================================================================
+
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))        # Page cache (64 MiB)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))            # Bytes of memory-mapped I/O (256 MiB)
+SQLITE_WAL_AUTOCHECKPOINT = int(os.getenv("SQLITE_WAL_AUTOCHECKPOINT", "1000"))  # WAL pages between checkpoints
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))     # Wait for locks before SQLITE_BUSY
+SQLITE_OPTIMIZE_INTERVAL = int(os.getenv("SQLITE_OPTIMIZE_INTERVAL", "900"))  # Seconds between PRAGMA optimize runs
+SQLITE_ANALYSIS_LIMIT = int(os.getenv("SQLITE_ANALYSIS_LIMIT", "1000"))      # Rows sampled per index by ANALYZE
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", str(os.cpu_count() or 4)))  # Read-only connections
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "1"))                      # Processes sharding the report query (1 = in-process)
+
 # ============================================================================
 # LOGGING
 # ============================================================================
@@ -134,6 +166,65 @@ LOG_TO_FILE = os.getenv("LOG_TO_FILE", "true").lower() == "true"
 LOG_MAX_SIZE_MB = int(os.getenv("LOG_MAX_SIZE_MB", "10"))
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
 
+# ============================================================================
+# FROZEN SNAPSHOT
+# ============================================================================
+
+@dataclass(slots=True, frozen=True)
+class Config:
+    """Immutable view of the settings read on hot paths (slot access, no module dict lookups)."""
+    gmgn_traders_url: str
+    gmgn_holders_url: str
+    gmgn_token_info_url: str
+    gmgn_rank_url: str
+    cielo_api_url: str
+    api_delay: float
+    max_concurrent_tokens: int
+    max_global_requests: int
+    gmgn_requests_per_second: float
+    max_concurrent_wallet_checks: int
+    request_delay_min: float
+    request_delay_max: float
+    break_after_batch: int
+    break_duration_min: float
+    break_duration_max: float
+    max_retries: int
+    circuit_breaker_threshold_with_proxies: int
+    circuit_breaker_threshold_no_proxies: int
+    circuit_open_duration: int
+    min_pnl_threshold: float
+    min_trades_threshold: int
+    min_high_profit_tokens: int
+    min_token_pnl_for_count: float
+
+
+# Built once at import; the module-level constants above stay for existing callers
+CFG = Config(
+    gmgn_traders_url=GMGN_TRADERS_URL,
+    gmgn_holders_url=GMGN_HOLDERS_URL,
+    gmgn_token_info_url=GMGN_TOKEN_INFO_URL,
+    gmgn_rank_url=GMGN_RANK_URL,
+    cielo_api_url=CIELO_API_URL,
+    api_delay=API_DELAY,
+    max_concurrent_tokens=MAX_CONCURRENT_TOKENS,
+    max_global_requests=MAX_GLOBAL_REQUESTS,
+    gmgn_requests_per_second=GMGN_REQUESTS_PER_SECOND,
+    max_concurrent_wallet_checks=MAX_CONCURRENT_WALLET_CHECKS,
+    request_delay_min=REQUEST_DELAY_MIN,
+    request_delay_max=REQUEST_DELAY_MAX,
+    break_after_batch=BREAK_AFTER_BATCH,
+    break_duration_min=BREAK_DURATION_MIN,
+    break_duration_max=BREAK_DURATION_MAX,
+    max_retries=MAX_RETRIES,
+    circuit_breaker_threshold_with_proxies=CIRCUIT_BREAKER_THRESHOLD_WITH_PROXIES,
+    circuit_breaker_threshold_no_proxies=CIRCUIT_BREAKER_THRESHOLD_NO_PROXIES,
+    circuit_open_duration=CIRCUIT_OPEN_DURATION,
+    min_pnl_threshold=MIN_PNL_THRESHOLD,
+    min_trades_threshold=MIN_TRADES_THRESHOLD,
+    min_high_profit_tokens=MIN_HIGH_PROFIT_TOKENS,
+    min_token_pnl_for_count=MIN_TOKEN_PNL_FOR_COUNT,
+)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -159,15 +250,18 @@ def register_manual_token(token_address: str):
     """Safely append a new token to the manual list if not present."""
     if not token_address or len(token_address) < 32:
         return
-        
-    current_tokens = set()
-    if MANUAL_TOKENS_PATH.exists():
-        with open(MANUAL_TOKENS_PATH, "r") as f:
-            current_tokens = {line.strip() for line in f if line.strip() and not line.strip().startswith("#")}
     
-    if token_address not in current_tokens:
+    mtime = _file_mtime(MANUAL_TOKENS_PATH)
+    if mtime != _manual_cache["mtime"]:
+        # Edited outside this process since we last looked
+        _manual_cache["tokens"] = _read_address_file(MANUAL_TOKENS_PATH)
+        _manual_cache["mtime"] = mtime
+    
+    if token_address not in _manual_cache["tokens"]:
         with open(MANUAL_TOKENS_PATH, "a") as f:
             f.write(f"{token_address}\n")
+        _manual_cache["tokens"].add(token_address)
+        _manual_cache["mtime"] = _file_mtime(MANUAL_TOKENS_PATH)
         return True
     return False
 
@@ -191,10 +285,43 @@ def print_config():
 BANNED_WALLETS_PATH = DATA_DIR / "banned_wallets.txt"
 
 def _load_banned_wallets():
-    wallets = set()
-    if BANNED_WALLETS_PATH.exists():
-        with open(BANNED_WALLETS_PATH, "r") as f:
-            wallets = {line.strip() for line in f if line.strip() and not line.strip().startswith("#")}
-    return wallets
+    return _read_address_file(BANNED_WALLETS_PATH)
 
-BANNED_WALLETS = _load_banned_wallets()
+# Replaced wholesale on reload (never mutated), so other threads can iterate a reference safely
+BANNED_WALLETS = frozenset(_load_banned_wallets())
+
+# banned_wallets.txt is re-checked at most once per interval, and re-read only if its mtime changed
+BANNED_RECHECK_INTERVAL = 5.0  # seconds
+_banned_cache = {"mtime": _file_mtime(BANNED_WALLETS_PATH), "checked": time.monotonic(), "generation": 0}
+# Guards _banned_cache and the BANNED_WALLETS swap (is_banned runs on the event loop, the DB writer on its own thread)
+_banned_lock = threading.Lock()
+
+
+def _refresh_banned_wallets():
+    """Re-read banned_wallets.txt if its mtime changed (checked at most once per interval)."""
+    global BANNED_WALLETS
+    if time.monotonic() - _banned_cache["checked"] < BANNED_RECHECK_INTERVAL:
+        return
+    with _banned_lock:
+        now = time.monotonic()
+        if now - _banned_cache["checked"] < BANNED_RECHECK_INTERVAL:
+            return  # another thread re-checked while we waited for the lock
+        _banned_cache["checked"] = now
+        mtime = _file_mtime(BANNED_WALLETS_PATH)
+        if mtime != _banned_cache["mtime"]:
+            _banned_cache["mtime"] = mtime
+            BANNED_WALLETS = frozenset(_read_address_file(BANNED_WALLETS_PATH))
+            _banned_cache["generation"] += 1
+
+
+def is_banned(wallet_address: str) -> bool:
+    """O(1) banned-wallet check that picks up edits to banned_wallets.txt while running."""
+    _refresh_banned_wallets()
+    return wallet_address in BANNED_WALLETS
+
+
+def banned_wallets_snapshot() -> Tuple[int, FrozenSet[str]]:
+    """(generation, BANNED_WALLETS) read together; the generation changes on every reload (for callers that mirror the set)."""
+    _refresh_banned_wallets()
+    with _banned_lock:
+        return _banned_cache["generation"], BANNED_WALLETS
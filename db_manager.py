@@ -1,10 +1,130 @@
 import sqlite3
 import threading
 import asyncio
+import json
+import queue
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from functools import partial
 import config
+from logger import get_logger
+
+# Rows pulled per fetchmany() call when streaming large result sets
+FETCH_BATCH_SIZE = 1024
+
+# Hot write statements, defined once so every call reuses the same text (and the
+# connection's prepared-statement cache entry) instead of re-parsing a new literal
+_SQL_UPSERT_WALLET = '''
+    INSERT INTO wallets (address) VALUES (?)
+    ON CONFLICT(address) DO UPDATE SET address = address
+    RETURNING id
+'''
+_SQL_SELECT_WALLET_ID = 'SELECT id FROM wallets WHERE address = ?'
+_SQL_UPSERT_TOKEN = '''
+    INSERT INTO tokens (address, symbol, ath_price) VALUES (?, ?, ?)
+    ON CONFLICT(address) DO UPDATE SET 
+        symbol = COALESCE(tokens.symbol, excluded.symbol),
+        ath_price = COALESCE(tokens.ath_price, excluded.ath_price)
+'''
+_SQL_UPSERT_TOKEN_RETURNING = _SQL_UPSERT_TOKEN + 'RETURNING id, symbol IS NOT NULL AND ath_price IS NOT NULL'
+_SQL_INSERT_HIT = '''
+    INSERT INTO discovery_hits (token_id, wallet_id, category, rank, pnl_on_token)
+    VALUES (?, ?, ?, ?, ?)
+'''
+# Batch forms of the above: the bound parameter is a JSON array of discovery-hit objects.
+# json_extract rather than ->> so these prepare on SQLite < 3.38 (any JSON1 build).
+# Hits for banned wallets are skipped; a token keeps the first non-NULL symbol/ath_price seen.
+_SQL_UPSERT_TOKENS_JSON = '''
+    INSERT INTO tokens (address, symbol, ath_price)
+    SELECT json_extract(value, '$.token_address'), json_extract(value, '$.symbol'),
+           json_extract(value, '$.ath_price')
+    FROM json_each(?)
+    WHERE json_extract(value, '$.wallet_address') NOT IN (SELECT address FROM temp.banned_wallets)
+    ORDER BY key
+    ON CONFLICT(address) DO UPDATE SET 
+        symbol = COALESCE(tokens.symbol, excluded.symbol),
+        ath_price = COALESCE(tokens.ath_price, excluded.ath_price)
+'''
+_SQL_INSERT_WALLETS_JSON = '''
+    INSERT INTO wallets (address)
+    SELECT json_extract(value, '$.wallet_address')
+    FROM json_each(?)
+    WHERE json_extract(value, '$.wallet_address') NOT IN (SELECT address FROM temp.banned_wallets)
+    ORDER BY key
+    ON CONFLICT(address) DO NOTHING
+'''
+_SQL_INSERT_HITS_JSON = '''
+    INSERT INTO discovery_hits (token_id, wallet_id, category, rank, pnl_on_token)
+    SELECT t.id, w.id, json_extract(j.value, '$.category'), json_extract(j.value, '$.rank'),
+           json_extract(j.value, '$.pnl_on_token')
+    FROM json_each(?) j
+    JOIN tokens t ON t.address = json_extract(j.value, '$.token_address')
+    JOIN wallets w ON w.address = json_extract(j.value, '$.wallet_address')
+    WHERE w.address NOT IN (SELECT address FROM temp.banned_wallets)
+    ORDER BY j.key
+'''
+_SQL_INSERT_STATS = '''
+    INSERT INTO cielo_stats (wallet_id, pnl_usd, trades_30d)
+    VALUES (?, ?, ?)
+'''
+_SQL_UPSERT_PORTFOLIO = '''
+    INSERT INTO wallet_portfolio (
+        wallet_id, token_address, symbol, name, pnl_usd, num_swaps, last_trade_ts, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(wallet_id, token_address) DO UPDATE SET
+        symbol = excluded.symbol,
+        name = excluded.name,
+        pnl_usd = excluded.pnl_usd,
+        num_swaps = excluded.num_swaps,
+        last_trade_ts = excluded.last_trade_ts,
+        updated_at = CURRENT_TIMESTAMP
+'''
+_SQL_INSERT_BOT = '''
+    INSERT INTO bots (wallet_id, reason) VALUES (?, ?)
+    ON CONFLICT(wallet_id) DO NOTHING
+'''
+# Mirrors bots onto wallets so bot-free scans can use idx_wallets_active
+_SQL_FLAG_BOT = 'UPDATE wallets SET is_bot = 1 WHERE id = ? AND is_bot = 0'
+
+
+def cielo_link(wallet_address: str) -> str:
+    """Cielo profile URL for a wallet (30d PnL view)."""
+    return f"{config.CIELO_BASE_URL}/profile/{wallet_address}?timeframe=30d&sortBy=pnl_desc"
+
+
+def gmgn_link(wallet_address: str) -> str:
+    """GMGN profile URL for a wallet."""
+    return f"{config.GMGN_BASE_URL}/sol/address/{wallet_address}"
+
+
+def _fetch_first_column(cursor: sqlite3.Cursor, batch_size: int = FETCH_BATCH_SIZE) -> List:
+    """First column of every remaining row, pulled in fetchmany batches so a full-table
+    scan never holds a second, complete list of row objects next to the result."""
+    values = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return values
+        values.extend(row[0] for row in rows)
+
+
+def _hit_pnl_desc(hit: Dict) -> Tuple[bool, float]:
+    """Sort key for token_hits: highest pnl first, missing pnl last (like ORDER BY pnl DESC)."""
+    pnl = hit['pnl']
+    return (pnl is None, -(pnl or 0))
+
+
+def _resolve_future(future: asyncio.Future, result, error: Optional[BaseException]):
+    """Complete a writer-thread future on its event loop (skipped if the awaiting task gave up)."""
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
 
 class DatabaseManager:
     """
@@ -20,39 +140,72 @@ class DatabaseManager:
     _instance = None
     _lock = threading.Lock()
     
+    # Max entries per in-process ID cache (oldest evicted first)
+    ID_CACHE_SIZE = 100_000
+    
     def __new__(cls, db_path: str = "wallet_finder.db"):
         """Ensure single instance (singleton pattern) - thread-safe."""
+        # Fast path: once published, the instance is returned without touching the lock
+        instance = cls._instance
+        if instance is not None:
+            return instance
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._initialized = False
-                cls._instance._db_path = db_path
+                instance = super().__new__(cls)
+                instance._initialized = False
+                instance._db_path = db_path
+                cls._instance = instance
             return cls._instance
     
     def __init__(self, db_path: str = "wallet_finder.db"):
+        # Fast path: _initialized is only set once setup has finished, so no lock is needed to see it
+        if self._initialized:
+            self._warn_if_other_path(db_path)
+            return
+        
         with self._lock:
             if self._initialized:
-                # Warn if trying to use different db_path than existing instance
-                if db_path != self._db_path:
-                    import warnings
-                    warnings.warn(
-                        f"DatabaseManager singleton already exists with db_path='{self._db_path}'. "
-                        f"Ignoring new db_path='{db_path}'.",
-                        RuntimeWarning
-                    )
+                self._warn_if_other_path(db_path)
                 return
             
             self.db_path = db_path
             self._db_path = db_path
             self._conn = None
             self._conn_lock = threading.Lock()
-            self._write_lock = threading.Lock()  # Lock for sync write operations
+            # Guards the single writer connection: a transaction belongs to the connection, not to a table,
+            # so writes can't be sharded per table here. Held only around connection work - payloads are
+            # built before taking it - and SQLite's busy_timeout + BEGIN IMMEDIATE serialize other processes.
+            self._write_lock = threading.RLock()  # Reentrant as a safety net; helpers given a cursor skip it entirely
             # Separate async locks: WAL mode allows concurrent reads with one writer
-            self._db_async_write_lock = asyncio.Lock()  # Serialize async writes
-            # No read lock needed - WAL mode handles concurrent reads natively
+            # Async writes are queued to one long-lived writer thread, so they run strictly
+            # in order without tying up the default executor
+            self._write_queue: queue.Queue = queue.Queue()
+            self._writer_thread: Optional[threading.Thread] = None
+            # No read lock needed - WAL mode handles concurrent reads natively,
+            # so reads use their own pool of read-only connections, opened on demand
+            self._read_pool: queue.Queue = queue.Queue()
+            self._read_conns: List[sqlite3.Connection] = []
+            # Async reads get their own executor, one worker per pooled connection, so they never
+            # queue behind unrelated to_thread work on the default executor (created on first use)
+            self._read_executor: Optional[ThreadPoolExecutor] = None
+            # address -> id caches for get_or_create_*, guarded by _write_lock and cleared on rollback
+            # (token entries also record whether symbol/ath_price are already filled in)
+            self._wallet_ids: Dict[str, int] = {}
+            self._token_ids: Dict[str, Tuple[int, bool]] = {}
             self._init_db()
+            self._start_writer()
             self._initialized = True
 
+    def _warn_if_other_path(self, db_path: str):
+        """Warn if trying to use different db_path than existing instance."""
+        if db_path != self._db_path:
+            import warnings
+            warnings.warn(
+                f"DatabaseManager singleton already exists with db_path='{self._db_path}'. "
+                f"Ignoring new db_path='{db_path}'.",
+                RuntimeWarning
+            )
+
     def _get_connection(self) -> sqlite3.Connection:
         """
         Returns a persistent connection. Thread-safe.
@@ -64,13 +217,60 @@ class DatabaseManager:
                     self._conn = sqlite3.connect(
                         self.db_path, 
                         check_same_thread=False,
-                        timeout=30.0  # Wait up to 30s for locks
+                        timeout=30.0,  # Wait up to 30s for locks
+                        cached_statements=256,  # Room for every hot statement plus the read queries
+                        isolation_level=None  # Autocommit; multi-statement writes open BEGIN IMMEDIATE themselves
                     )
                     # Enable WAL mode for better concurrent read/write
                     self._conn.execute("PRAGMA journal_mode=WAL")
                     self._conn.execute("PRAGMA synchronous=NORMAL")
+                    self._conn.execute(f"PRAGMA wal_autocheckpoint={config.SQLITE_WAL_AUTOCHECKPOINT:d}")
+                    self._conn.execute("PRAGMA foreign_keys=ON")
+                    # Bound the rows ANALYZE / PRAGMA optimize scan per index
+                    self._conn.execute(f"PRAGMA analysis_limit={config.SQLITE_ANALYSIS_LIMIT:d}")
+                    self._apply_pragmas(self._conn)
+                    # Connection-local mirror of config.BANNED_WALLETS for set-based filtering
+                    self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS banned_wallets (address TEXT PRIMARY KEY) WITHOUT ROWID")
+                    self._banned_generation = None
         return self._conn
 
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection):
+        """Per-connection tuning shared by the writer and the read pool."""
+        # Keep temp tables/indexes in RAM, map the file, and size the page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE:d}")
+        conn.execute(f"PRAGMA cache_size={-config.SQLITE_CACHE_SIZE_KB:d}")
+        conn.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS:d}")
+
+    @contextmanager
+    def _borrow_read_conn(self):
+        """
+        Borrow a read-only connection from the pool (blocking while all are in use).
+        Readers never share a connection with each other or with the writer.
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._conn_lock:
+                if len(self._read_conns) < config.SQLITE_READ_POOL_SIZE:
+                    conn = sqlite3.connect(
+                        f"{Path(self.db_path).absolute().as_uri()}?mode=ro",
+                        uri=True,
+                        check_same_thread=False,
+                        cached_statements=256
+                    )
+                    conn.row_factory = sqlite3.Row  # Name access without building a dict per row
+                    self._apply_pragmas(conn)
+                    self._read_conns.append(conn)
+            if conn is None:
+                conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
     def _init_db(self):
         """Initialize the database schema."""
         conn = self._get_connection()
@@ -87,18 +287,13 @@ class DatabaseManager:
             )
         ''')
         
-        # Table for Wallets with Generated Links
+        # Table for Wallets (profile links are built on demand by cielo_link/gmgn_link)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS wallets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 address TEXT UNIQUE NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                cielo_link TEXT GENERATED ALWAYS AS (
-                    'https://app.cielo.finance/profile/' || address || '?timeframe=30d&sortBy=pnl_desc'
-                ) VIRTUAL,
-                gmgn_link TEXT GENERATED ALWAYS AS (
-                    'https://gmgn.ai/sol/address/' || address
-                ) VIRTUAL
+                is_bot INTEGER NOT NULL DEFAULT 0
             )
         ''')
         
@@ -159,14 +354,28 @@ class DatabaseManager:
         # Indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_wallet_address ON wallets(address)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_token_address ON tokens(address)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_discovery_wallet ON discovery_hits(wallet_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stats_wallet ON cielo_stats(wallet_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_wallet ON wallet_portfolio(wallet_id)')
+        # Compound indexes for the per-wallet joins, latest-check lookup and portfolio filter
+        # (bots.wallet_id is UNIQUE, so it already has its own index)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_discovery_wallet_token ON discovery_hits(wallet_id, token_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stats_wallet_captured ON cielo_stats(wallet_id, captured_at DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_pnl ON wallet_portfolio(wallet_id, pnl_usd DESC)')
+        # Lets manage_queue's DISTINCT ... EXCEPT over portfolio tokens walk an index instead of sorting
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_token ON wallet_portfolio(token_address)')
+        # Covers the report's latest-snapshot window (PARTITION BY wallet_id ORDER BY id DESC) without a sort
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stats_wallet_latest ON cielo_stats(wallet_id, id DESC, pnl_usd, trades_30d, captured_at)')
+        # Single-column indexes superseded by the compound ones above
+        cursor.execute('DROP INDEX IF EXISTS idx_discovery_wallet')
+        cursor.execute('DROP INDEX IF EXISTS idx_stats_wallet')
+        cursor.execute('DROP INDEX IF EXISTS idx_portfolio_wallet')
         
         conn.commit()
         
         # Run migrations after initial schema
         self._run_migrations()
+        
+        # Refresh planner statistics once at open (sampled via analysis_limit, so cheap on big files);
+        # start_optimize_task keeps them current afterwards
+        cursor.execute('ANALYZE')
 
     def _get_schema_version(self) -> int:
         """Get current database schema version."""
@@ -210,82 +419,142 @@ class DatabaseManager:
         current_version = self._get_schema_version()
         logger = get_logger()
         
-        # Example Migration 1: Add last_updated column to wallets
-        # (Not needed now, but shows the pattern)
-        # if current_version < 1:
-        #     logger.info("📦 Applying migration 1: Adding last_updated column to wallets...")
-        #     conn = self._get_connection()
-        #     cursor = conn.cursor()
-        #     cursor.execute('ALTER TABLE wallets ADD COLUMN last_updated TIMESTAMP')
-        #     conn.commit()
-        #     self._set_schema_version(1, "Added last_updated column to wallets")
-        #     logger.info("   ✅ Migration 1 complete")
+        # Migration 1: Drop the VIRTUAL cielo_link/gmgn_link columns from wallets.
+        # SQLite can't ALTER generated columns away, so older databases get the table rebuilt.
+        if current_version < 1:
+            conn = self._get_connection()
+            columns = [row[1] for row in conn.execute('PRAGMA table_xinfo(wallets)')]
+            if 'cielo_link' in columns or 'gmgn_link' in columns:
+                logger.info("📦 Applying migration 1: Dropping generated link columns from wallets...")
+                conn.execute('PRAGMA foreign_keys=OFF')
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    try:
+                        conn.execute('''
+                            CREATE TABLE wallets_new (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                address TEXT UNIQUE NOT NULL,
+                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                            )
+                        ''')
+                        conn.execute('INSERT INTO wallets_new (id, address, created_at) SELECT id, address, created_at FROM wallets')
+                        conn.execute('DROP TABLE wallets')
+                        conn.execute('ALTER TABLE wallets_new RENAME TO wallets')
+                        conn.execute('CREATE INDEX IF NOT EXISTS idx_wallet_address ON wallets(address)')
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                finally:
+                    conn.execute('PRAGMA foreign_keys=ON')
+                logger.info("   ✅ Migration 1 complete")
+            self._set_schema_version(1, "Dropped generated link columns from wallets")
+        
+        # Migration 2: Drop the denormalized wallet_address column from cielo_stats.
+        # The address is reachable through wallet_id; the column only exists on databases that added it by hand.
+        if current_version < 2:
+            conn = self._get_connection()
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(cielo_stats)')]
+            if 'wallet_address' in columns:
+                logger.info("📦 Applying migration 2: Dropping wallet_address from cielo_stats...")
+                conn.execute('ALTER TABLE cielo_stats DROP COLUMN wallet_address')  # SQLite >= 3.35
+                logger.info("   ✅ Migration 2 complete")
+            self._set_schema_version(2, "Dropped wallet_address from cielo_stats")
+        
+        # Migration 3: Flag bots on wallets and index the non-bot wallets, so the
+        # all-wallets scan reads one small partial index instead of joining bots.
+        if current_version < 3:
+            conn = self._get_connection()
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(wallets)')]
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if 'is_bot' not in columns:
+                    logger.info("📦 Applying migration 3: Adding wallets.is_bot...")
+                    conn.execute('ALTER TABLE wallets ADD COLUMN is_bot INTEGER NOT NULL DEFAULT 0')
+                    conn.execute('UPDATE wallets SET is_bot = 1 WHERE id IN (SELECT wallet_id FROM bots)')
+                    logger.info("   ✅ Migration 3 complete")
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_wallets_active ON wallets(id, address) WHERE is_bot = 0')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            self._set_schema_version(3, "Added wallets.is_bot and idx_wallets_active")
         
         # Future migrations go here
-        # if current_version < 2:
-        #     logger.info("📦 Applying migration 2: ...")
+        # if current_version < 4:
+        #     logger.info("📦 Applying migration 4: ...")
         #     ...
-        #     self._set_schema_version(2, "Description of migration 2")
-        #     logger.info("   ✅ Migration 2 complete")
+        #     self._set_schema_version(4, "Description of migration 4")
+        #     logger.info("   ✅ Migration 4 complete")
         
-        if current_version == 0:
+        if current_version >= 3:
             logger.debug("Database schema is up to date (no migrations needed)")
 
     def get_or_create_wallet(self, wallet_address: str, cursor: sqlite3.Cursor = None) -> int:
         """
         Returns the internal ID of a wallet, creating it if it doesn't exist.
-        Uses INSERT ... ON CONFLICT ... RETURNING for single-query efficiency.
-        Thread-safe with write lock.
+        Uses INSERT ... ON CONFLICT ... RETURNING for single-query efficiency;
+        known wallets are answered from the in-process ID cache.
+        Thread-safe with write lock. Passing a cursor means the caller already holds
+        the lock and owns the transaction, so neither is taken or committed here.
         """
-        if wallet_address in config.BANNED_WALLETS:
+        if config.is_banned(wallet_address):
             raise ValueError(f"CRITICAL: Attempted to process BANNED wallet {wallet_address}. Blocking database write.")
 
+        if cursor is not None:
+            return self._wallet_id(wallet_address, cursor)
+        
         with self._write_lock:
             conn = self._get_connection()
-            active_cursor = cursor or conn.cursor()
-            
-            # Single query: Insert if not exists, always return ID
-            # SQLite 3.35+ supports RETURNING clause
-            active_cursor.execute('''
-                INSERT INTO wallets (address) VALUES (?)
-                ON CONFLICT(address) DO UPDATE SET address = address
-                RETURNING id
-            ''', (wallet_address,))
-            
-            result = active_cursor.fetchone()
-            
-            if cursor is None:
-                conn.commit()
-            
-            return result[0]
+            wallet_id = self._wallet_id(wallet_address, conn.cursor())
+            conn.commit()
+            return wallet_id
+
+    def _wallet_id(self, wallet_address: str, cursor: sqlite3.Cursor) -> int:
+        """Cached wallet ID, or upsert it via `cursor`. Caller holds _write_lock."""
+        wallet_id = self._wallet_ids.get(wallet_address)
+        if wallet_id is not None:
+            return wallet_id
+        
+        # Single query: Insert if not exists, always return ID
+        # SQLite 3.35+ supports RETURNING clause
+        cursor.execute(_SQL_UPSERT_WALLET, (wallet_address,))
+        
+        wallet_id = cursor.fetchone()[0]
+        self._cache_id(self._wallet_ids, wallet_address, wallet_id)
+        return wallet_id
 
     def get_or_create_token(self, token_address: str, symbol: str = None, ath_price: float = None, cursor: sqlite3.Cursor = None) -> int:
         """
         Returns the internal ID of a token, creating it if it doesn't exist.
         Uses INSERT ... ON CONFLICT ... RETURNING for efficiency.
         Updates symbol/ath_price if they were NULL.
-        Thread-safe with write lock.
+        Thread-safe with write lock. Passing a cursor means the caller already holds
+        the lock and owns the transaction, so neither is taken or committed here.
         """
+        if cursor is not None:
+            return self._token_id(token_address, symbol, ath_price, cursor)
+        
         with self._write_lock:
             conn = self._get_connection()
-            active_cursor = cursor or conn.cursor()
-            
-            # Single query using UPSERT pattern with RETURNING
-            # This handles: insert new, return existing, and update NULL fields
-            active_cursor.execute('''
-                INSERT INTO tokens (address, symbol, ath_price) VALUES (?, ?, ?)
-                ON CONFLICT(address) DO UPDATE SET 
-                    symbol = COALESCE(tokens.symbol, excluded.symbol),
-                    ath_price = COALESCE(tokens.ath_price, excluded.ath_price)
-                RETURNING id
-            ''', (token_address, symbol, ath_price))
-            
-            result = active_cursor.fetchone()
-            
-            if cursor is None:
-                conn.commit()
-            
-            return result[0]
+            token_id = self._token_id(token_address, symbol, ath_price, conn.cursor())
+            conn.commit()
+            return token_id
+
+    def _token_id(self, token_address: str, symbol: Optional[str], ath_price: Optional[float], cursor: sqlite3.Cursor) -> int:
+        """Cached token ID, or upsert it via `cursor`. Caller holds _write_lock."""
+        # Cached unless this call could still fill in a NULL symbol/ath_price
+        cached = self._token_ids.get(token_address)
+        if cached is not None and (cached[1] or (symbol is None and ath_price is None)):
+            return cached[0]
+        
+        # Single query using UPSERT pattern with RETURNING
+        # This handles: insert new, return existing, and update NULL fields
+        cursor.execute(_SQL_UPSERT_TOKEN_RETURNING, (token_address, symbol, ath_price))
+        
+        token_id, complete = cursor.fetchone()
+        self._cache_id(self._token_ids, token_address, (token_id, bool(complete)))
+        return token_id
 
     def add_discovery_hit(self, token_address: str, wallet_address: str, category: str, rank: int, pnl_on_token: float, symbol: str = None, ath_price: float = None):
         """
@@ -298,18 +567,16 @@ class DatabaseManager:
             cursor = conn.cursor()
             
             try:
+                conn.execute('BEGIN IMMEDIATE')
                 # All operations share the same cursor/transaction
                 token_id = self.get_or_create_token(token_address, symbol, ath_price, cursor=cursor)
                 wallet_id = self.get_or_create_wallet(wallet_address, cursor=cursor)
                 
-                cursor.execute('''
-                    INSERT INTO discovery_hits (token_id, wallet_id, category, rank, pnl_on_token)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (token_id, wallet_id, category, rank, pnl_on_token))
+                cursor.execute(_SQL_INSERT_HIT, (token_id, wallet_id, category, rank, pnl_on_token))
                 
                 conn.commit()
             except Exception as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
     def add_discovery_hits_batch(self, hits: List[Dict]):
@@ -323,67 +590,68 @@ class DatabaseManager:
         if not hits:
             return
         
+        payload = json.dumps(hits)
+        
         with self._write_lock:
             conn = self._get_connection()
             cursor = conn.cursor()
             
+            # Double-check safety: banned wallets are skipped inside each statement (temp.banned_wallets)
+            self._sync_banned_wallets(conn)
+            
             try:
-                # Cache for token/wallet IDs to avoid repeated lookups within the batch
-                token_cache = {}
-                wallet_cache = {}
+                # Reserve SQLite's write lock up front; the whole batch commits as one transaction
+                conn.execute('BEGIN IMMEDIATE')
                 
-                for hit in hits:
-                    token_addr = hit['token_address']
-                    wallet_addr = hit['wallet_address']
-                    
-                    # Double-check safety: Skip banned wallets
-                    if wallet_addr in config.BANNED_WALLETS:
-                        continue
-                    
-                    # Get or create token (use cache if available)
-                    if token_addr not in token_cache:
-                        token_cache[token_addr] = self.get_or_create_token(
-                            token_addr, 
-                            hit.get('symbol'), 
-                            hit.get('ath_price'),
-                            cursor=cursor
-                        )
-                    token_id = token_cache[token_addr]
-                    
-                    # Get or create wallet (use cache if available)
-                    if wallet_addr not in wallet_cache:
-                        wallet_cache[wallet_addr] = self.get_or_create_wallet(wallet_addr, cursor=cursor)
-                    wallet_id = wallet_cache[wallet_addr]
-                    
-                    cursor.execute('''
-                        INSERT INTO discovery_hits (token_id, wallet_id, category, rank, pnl_on_token)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (token_id, wallet_id, hit['category'], hit['rank'], hit['pnl_on_token']))
+                # The batch is bound once as a JSON array and expanded by json_each, so each
+                # step is one statement and IDs are resolved by joins instead of in Python
+                cursor.execute(_SQL_UPSERT_TOKENS_JSON, (payload,))
+                cursor.execute(_SQL_INSERT_WALLETS_JSON, (payload,))
+                cursor.execute(_SQL_INSERT_HITS_JSON, (payload,))
                 
                 conn.commit()
                 
             except Exception as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
+    def _sync_banned_wallets(self, conn: sqlite3.Connection):
+        """Reload temp.banned_wallets if config's banned set changed since the last sync. Caller holds _write_lock."""
+        generation, banned = config.banned_wallets_snapshot()
+        if generation != self._banned_generation:
+            conn.execute('DELETE FROM temp.banned_wallets')
+            conn.executemany('INSERT INTO temp.banned_wallets (address) VALUES (?)', [(addr,) for addr in banned])
+            self._banned_generation = generation
+
+    def _cache_id(self, cache: Dict, address: str, value):
+        """Store an ID cache entry, evicting the oldest once ID_CACHE_SIZE is exceeded. Caller holds _write_lock."""
+        cache[address] = value
+        if len(cache) > self.ID_CACHE_SIZE:
+            del cache[next(iter(cache))]
+
+    def _rollback(self, conn: sqlite3.Connection):
+        """Roll back and drop the ID caches, which may now name rows that were never committed."""
+        conn.rollback()
+        self._wallet_ids.clear()
+        self._token_ids.clear()
+
     def add_cielo_stats(self, wallet_address: str, pnl_usd: float, trades: int):
         """Adds a new performance snapshot for a wallet. Thread-safe with write lock."""
+        rounded_pnl = round(pnl_usd, 2)
+        
         with self._write_lock:
             conn = self._get_connection()
             cursor = conn.cursor()
             
             try:
+                conn.execute('BEGIN IMMEDIATE')
                 wallet_id = self.get_or_create_wallet(wallet_address, cursor=cursor)
-                rounded_pnl = round(pnl_usd, 2)
                 
-                cursor.execute('''
-                    INSERT INTO cielo_stats (wallet_id, wallet_address, pnl_usd, trades_30d)
-                    VALUES (?, ?, ?, ?)
-                ''', (wallet_id, wallet_address, rounded_pnl, trades))
+                cursor.execute(_SQL_INSERT_STATS, (wallet_id, rounded_pnl, trades))
                 
                 conn.commit()
             except Exception as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
     def add_cielo_stats_batch(self, stats: List[Dict]):
@@ -396,186 +664,170 @@ class DatabaseManager:
         if not stats:
             return
         
+        values = [(stat['wallet_address'], round(stat['pnl_usd'], 2), stat['trades']) for stat in stats]
+        
         with self._write_lock:
             conn = self._get_connection()
             cursor = conn.cursor()
             
             try:
-                wallet_cache = {}
+                conn.execute('BEGIN IMMEDIATE')
+                rows = [
+                    (self.get_or_create_wallet(address, cursor=cursor), pnl, trades)  # Cached after first use
+                    for address, pnl, trades in values
+                ]
                 
-                for stat in stats:
-                    wallet_addr = stat['wallet_address']
-                    
-                    if wallet_addr not in wallet_cache:
-                        wallet_cache[wallet_addr] = self.get_or_create_wallet(wallet_addr, cursor=cursor)
-                    wallet_id = wallet_cache[wallet_addr]
-                    
-                    cursor.execute('''
-                        INSERT INTO cielo_stats (wallet_id, wallet_address, pnl_usd, trades_30d)
-                        VALUES (?, ?, ?, ?)
-                    ''', (wallet_id, wallet_addr, round(stat['pnl_usd'], 2), stat['trades']))
+                cursor.executemany(_SQL_INSERT_STATS, rows)
                 
                 conn.commit()
                 
             except Exception as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
+    def get_token_info(self, token_address: str) -> Optional[sqlite3.Row]:
+        """(symbol, ath_price) row for a known token, or None if it isn't in the database."""
+        with self._borrow_read_conn() as conn:
+            return conn.execute(
+                'SELECT symbol, ath_price FROM tokens WHERE address = ?', (token_address,)
+            ).fetchone()
+
     def get_pending_wallets(self, min_hours_since_check: int = 168) -> List[str]:
         """Gets wallets that need auditing (un-checked, or checked long ago), excluding bots."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._borrow_read_conn() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT DISTINCT w.address
-            FROM wallets w
-            JOIN discovery_hits dh ON w.id = dh.wallet_id
-            LEFT JOIN bots b ON w.id = b.wallet_id
-            LEFT JOIN (
-                SELECT wallet_id, MAX(captured_at) as last_check
-                FROM cielo_stats
-                GROUP BY wallet_id
-            ) stats ON w.id = stats.wallet_id
-            WHERE b.id IS NULL 
-            AND (stats.last_check IS NULL 
-                 OR (julianday('now') - julianday(stats.last_check)) * 24 > ?)
-        ''', (min_hours_since_check,))
-        
-        return [row[0] for row in cursor.fetchall()]
+            # Anti-joins: each NOT EXISTS stops at the first matching row, and the
+            # recent-check probe is a range seek on idx_stats_wallet_captured
+            cursor.execute('''
+                SELECT w.address
+                FROM wallets w
+                WHERE EXISTS (SELECT 1 FROM discovery_hits dh WHERE dh.wallet_id = w.id)
+                AND NOT EXISTS (SELECT 1 FROM bots b WHERE b.wallet_id = w.id)
+                AND NOT EXISTS (
+                    SELECT 1 FROM cielo_stats cs
+                    WHERE cs.wallet_id = w.id
+                    AND cs.captured_at > datetime('now', printf('-%d hours', ?))
+                )
+            ''', (min_hours_since_check,))
+        
+            return _fetch_first_column(cursor)
 
     def get_top_alpha_wallets(self, min_token_overlap: int = 2) -> List[Dict]:
         """
         Returns wallets found in multiple tokens, ranked by consistency.
-        Returns structured data instead of concatenated strings.
+        Returns structured data instead of concatenated strings; each wallet's
+        token_hits are dicts (symbol, pnl, category, rank), best PnL first.
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._borrow_read_conn() as conn:
+            cursor = conn.cursor()
         
-        # Step 1: Get wallets that appear in multiple tokens
-        cursor.execute('''
-            SELECT 
-                w.id,
-                w.address,
-                COUNT(DISTINCT dh.token_id) as token_count,
-                MAX(cs.pnl_usd) as global_pnl,
-                MAX(cs.trades_30d) as total_trades
-            FROM wallets w
-            JOIN discovery_hits dh ON w.id = dh.wallet_id
-            LEFT JOIN cielo_stats cs ON w.id = cs.wallet_id
-            GROUP BY w.id
-            HAVING token_count >= ?
-            ORDER BY token_count DESC, global_pnl DESC
-        ''', (min_token_overlap,))
-        
-        wallets = cursor.fetchall()
-        
-        if not wallets:
-            return []
-        
-        wallet_ids = [row[0] for row in wallets]
-        
-        # Step 2: Get token details for these wallets in a single query
-        # Build parameterized query safely without f-strings
-        placeholders = ','.join('?' * len(wallet_ids))
-        query = '''
-            SELECT 
-                dh.wallet_id,
-                t.symbol,
-                ROUND(dh.pnl_on_token, 0) as pnl,
-                dh.category,
-                dh.rank
-            FROM discovery_hits dh
-            JOIN tokens t ON dh.token_id = t.id
-            WHERE dh.wallet_id IN ({})
-            ORDER BY dh.wallet_id, dh.pnl_on_token DESC
-        '''.format(placeholders)
-        cursor.execute(query, wallet_ids)
-        
-        # Group token details by wallet_id
-        token_details_by_wallet = {}
-        for row in cursor.fetchall():
-            wallet_id = row[0]
-            if wallet_id not in token_details_by_wallet:
-                token_details_by_wallet[wallet_id] = []
-            token_details_by_wallet[wallet_id].append({
-                'symbol': row[1],
-                'pnl': row[2],
-                'category': row[3],
-                'rank': row[4]
-            })
-        
-        # Build final result with structured data
-        results = []
-        for wallet_row in wallets:
-            wallet_id, address, token_count, global_pnl, total_trades = wallet_row
-            results.append({
-                'address': address,
-                'token_count': token_count,
-                'global_pnl': global_pnl or 0,
-                'total_trades': total_trades or 0,
-                'token_hits': token_details_by_wallet.get(wallet_id, [])
-            })
-        
-        return results
+            # One round trip: rank the wallets in a CTE and let SQLite build each
+            # wallet's token_hits as a JSON array (no second IN (...) query)
+            cursor.execute('''
+                WITH top AS (
+                    SELECT 
+                        w.id,
+                        w.address,
+                        COUNT(DISTINCT dh.token_id) as token_count,
+                        MAX(cs.pnl_usd) as global_pnl,
+                        MAX(cs.trades_30d) as total_trades
+                    FROM wallets w
+                    JOIN discovery_hits dh ON w.id = dh.wallet_id
+                    LEFT JOIN cielo_stats cs ON w.id = cs.wallet_id
+                    GROUP BY w.id
+                    HAVING token_count >= ?
+                )
+                SELECT 
+                    top.address,
+                    top.token_count,
+                    top.global_pnl,
+                    top.total_trades,
+                    (
+                        SELECT json_group_array(json_object(
+                            'symbol', hit.symbol, 'pnl', hit.pnl, 'category', hit.category, 'rank', hit.rank
+                        ))
+                        FROM (
+                            SELECT t.symbol, ROUND(dh.pnl_on_token, 0) as pnl, dh.category, dh.rank
+                            FROM discovery_hits dh
+                            JOIN tokens t ON dh.token_id = t.id
+                            WHERE dh.wallet_id = top.id
+                        ) hit
+                    ) as token_hits
+                FROM top
+                ORDER BY top.token_count DESC, top.global_pnl DESC
+            ''', (min_token_overlap,))
+        
+            results = []
+            for address, token_count, global_pnl, total_trades, token_hits in cursor.fetchall():
+                # json_group_array's input order isn't guaranteed (in-aggregate ORDER BY
+                # needs SQLite 3.44), so sort here: best PnL first, NULLs last
+                hits = json.loads(token_hits)
+                hits.sort(key=_hit_pnl_desc)
+                results.append({
+                    'address': address,
+                    'token_count': token_count,
+                    'global_pnl': global_pnl or 0,
+                    'total_trades': total_trades or 0,
+                    'token_hits': hits
+                })
+        
+            return results
 
     def save_wallet_portfolio(self, wallet_address: str, trades: List[Dict]):
         """Save high-performing trades for a specific wallet. Thread-safe with write lock."""
+        # Normalize trades before taking the lock; wallet_id is filled in once it's known
+        values = [
+            (
+                trade.get('token_address'),
+                trade.get('symbol') or trade.get('token_symbol'), # Handle both keys
+                trade.get('name') or trade.get('token_name'),
+                trade.get('pnl_usd') or trade.get('total_pnl_usd'),
+                trade.get('num_swaps'),
+                trade.get('last_trade_ts') or trade.get('last_trade')
+            )
+            for trade in trades
+        ]
+        
         with self._write_lock:
             conn = self._get_connection()
             cursor = conn.cursor()
             
-            try:
-                # 1. Get wallet ID
-                cursor.execute("SELECT id FROM wallets WHERE address = ?", (wallet_address,))
+            # 1. Get wallet ID
+            wallet_id = self._wallet_ids.get(wallet_address)
+            if wallet_id is None:
+                cursor.execute(_SQL_SELECT_WALLET_ID, (wallet_address,))
                 row = cursor.fetchone()
                 if not row:
                     return
                 wallet_id = row[0]
+            
+            try:
+                conn.execute('BEGIN IMMEDIATE')
                 
                 # 2. UPSERT trades
-                # Batch insert for efficiency
-                for trade in trades:
-                    cursor.execute('''
-                        INSERT INTO wallet_portfolio (
-                            wallet_id, token_address, symbol, name, pnl_usd, num_swaps, last_trade_ts, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        ON CONFLICT(wallet_id, token_address) DO UPDATE SET
-                            symbol = excluded.symbol,
-                            name = excluded.name,
-                            pnl_usd = excluded.pnl_usd,
-                            num_swaps = excluded.num_swaps,
-                            last_trade_ts = excluded.last_trade_ts,
-                            updated_at = CURRENT_TIMESTAMP
-                    ''', (
-                        wallet_id,
-                        trade.get('token_address'),
-                        trade.get('symbol') or trade.get('token_symbol'), # Handle both keys
-                        trade.get('name') or trade.get('token_name'),
-                        trade.get('pnl_usd') or trade.get('total_pnl_usd'),
-                        trade.get('num_swaps'),
-                        trade.get('last_trade_ts') or trade.get('last_trade')
-                    ))
+                # Batch insert for efficiency: one prepared statement for every trade
+                cursor.executemany(_SQL_UPSERT_PORTFOLIO, ((wallet_id, *value) for value in values))
                 
                 conn.commit()
             except sqlite3.Error as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
-    def get_wallet_portfolio(self, wallet_address: str, min_pnl: float = 1000) -> List[Dict]:
-        """Fetch saved portfolio for a wallet, filtered by PnL."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    def get_wallet_portfolio(self, wallet_address: str, min_pnl: float = 1000) -> List[sqlite3.Row]:
+        """Fetch saved portfolio for a wallet, filtered by PnL. Rows support row['pnl_usd'] and dict(row)."""
+        with self._borrow_read_conn() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT wp.token_address, wp.symbol, wp.name, wp.pnl_usd, wp.num_swaps
-            FROM wallet_portfolio wp
-            JOIN wallets w ON wp.wallet_id = w.id
-            WHERE w.address = ? AND wp.pnl_usd >= ?
-            ORDER BY wp.pnl_usd DESC
-        ''', (wallet_address, min_pnl))
+            cursor.execute('''
+                SELECT wp.token_address, wp.symbol, wp.name, wp.pnl_usd, wp.num_swaps
+                FROM wallet_portfolio wp
+                JOIN wallets w ON wp.wallet_id = w.id
+                WHERE w.address = ? AND wp.pnl_usd >= ?
+                ORDER BY wp.pnl_usd DESC
+            ''', (wallet_address, min_pnl))
         
-        columns = [col[0] for col in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return cursor.fetchall()
 
     def mark_as_bot(self, wallet_address: str, reason: str = "over 5k trades"):
         """Mark a wallet as a bot to permanently exclude it from auditing. Thread-safe with write lock."""
@@ -583,102 +835,185 @@ class DatabaseManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             try:
+                conn.execute('BEGIN IMMEDIATE')
                 wallet_id = self.get_or_create_wallet(wallet_address, cursor=cursor)
-                cursor.execute('''
-                    INSERT INTO bots (wallet_id, reason) VALUES (?, ?)
-                    ON CONFLICT(wallet_id) DO NOTHING
-                ''', (wallet_id, reason))
+                cursor.execute(_SQL_INSERT_BOT, (wallet_id, reason))
+                cursor.execute(_SQL_FLAG_BOT, (wallet_id,))
                 conn.commit()
             except Exception as e:
-                conn.rollback()
+                self._rollback(conn)
                 raise e
 
+    def optimize(self):
+        """Run PRAGMA optimize so SQLite refreshes statistics for tables whose shape changed."""
+        with self._write_lock:
+            self._get_connection().execute("PRAGMA optimize")
+
     def close(self):
-        """Explicitly close the database connection."""
+        """Explicitly close the database connections (after queued writes finish) and drop the ID caches."""
+        writer = self._writer_thread
+        if writer is not None and writer.is_alive():
+            self._write_queue.put(None)
+            if writer is not threading.current_thread():
+                writer.join()
+        self._writer_thread = None
+        with self._write_lock:
+            self._wallet_ids.clear()
+            self._token_ids.clear()
         if self._conn:
+            # SQLite recommends a final optimize before closing a long-lived connection
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                get_logger().warning("PRAGMA optimize failed: %s", e)
             self._conn.close()
             self._conn = None
+        with self._conn_lock:
+            if self._read_executor is not None:
+                self._read_executor.shutdown(wait=True)
+                self._read_executor = None
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns.clear()
+            self._read_pool = queue.Queue()
+
+    # =========================================================================
+    # WRITER THREAD - all async writes run here, one at a time, in submit order
+    # =========================================================================
+
+    def _start_writer(self):
+        """Start the writer thread if it isn't running."""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+            self._writer_thread.start()
+
+    def _writer_loop(self):
+        """Run queued (fn, args, loop, future) items until a None sentinel arrives."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            fn, args, loop, future = item
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                loop.call_soon_threadsafe(_resolve_future, future, None, e)
+            else:
+                loop.call_soon_threadsafe(_resolve_future, future, result, None)
+
+    def _submit_write(self, fn, *args) -> asyncio.Future:
+        """Queue a sync write method for the writer thread; await the returned future for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._start_writer()
+        self._write_queue.put((fn, args, loop, future))
+        return future
+
+    def _submit_read(self, fn, *args) -> asyncio.Future:
+        """Run a sync read on the reader executor; await the returned future for its result."""
+        if self._read_executor is None:
+            with self._conn_lock:
+                if self._read_executor is None:
+                    self._read_executor = ThreadPoolExecutor(
+                        max_workers=config.SQLITE_READ_POOL_SIZE,
+                        thread_name_prefix="db-read"
+                    )
+        return asyncio.get_running_loop().run_in_executor(self._read_executor, fn, *args)
 
     # =========================================================================
     # ASYNC WRAPPERS - Non-blocking versions for use in async code
-    # These run the sync operations in a thread pool to avoid blocking
-    # the asyncio event loop.
-    # WAL mode allows concurrent reads, so only writes need locking.
+    # Writes go through the writer thread; reads run on the reader executor
+    # against pooled read-only connections (WAL mode allows concurrent reads).
     # =========================================================================
 
     async def async_get_or_create_token(self, token_address: str, symbol: str = None, ath_price: float = None) -> int:
-        """Async version of get_or_create_token - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.get_or_create_token, token_address, symbol, ath_price)
+        """Async version of get_or_create_token - runs on the writer thread."""
+        return await self._submit_write(self.get_or_create_token, token_address, symbol, ath_price)
 
     async def async_add_discovery_hit(self, token_address: str, wallet_address: str, 
                                        category: str, rank: int, pnl_on_token: float, 
                                        symbol: str = None, ath_price: float = None):
-        """Async version of add_discovery_hit - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(
-                self.add_discovery_hit, 
-                token_address, wallet_address, category, rank, pnl_on_token, symbol, ath_price
-            )
+        """Async version of add_discovery_hit - runs on the writer thread."""
+        return await self._submit_write(
+            self.add_discovery_hit, 
+            token_address, wallet_address, category, rank, pnl_on_token, symbol, ath_price
+        )
 
     async def async_add_discovery_hits_batch(self, hits: List[Dict]):
-        """Async version of add_discovery_hits_batch - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.add_discovery_hits_batch, hits)
+        """Async version of add_discovery_hits_batch - runs on the writer thread."""
+        return await self._submit_write(self.add_discovery_hits_batch, hits)
 
     async def async_add_cielo_stats(self, wallet_address: str, pnl_usd: float, trades: int):
-        """Async version of add_cielo_stats - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.add_cielo_stats, wallet_address, pnl_usd, trades)
+        """Async version of add_cielo_stats - runs on the writer thread."""
+        return await self._submit_write(self.add_cielo_stats, wallet_address, pnl_usd, trades)
 
     async def async_add_cielo_stats_batch(self, stats: List[Dict]):
-        """Async version of add_cielo_stats_batch - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.add_cielo_stats_batch, stats)
+        """Async version of add_cielo_stats_batch - runs on the writer thread."""
+        return await self._submit_write(self.add_cielo_stats_batch, stats)
+
+    async def async_get_token_info(self, token_address: str) -> Optional[sqlite3.Row]:
+        """Async version of get_token_info - runs on the reader executor. No lock needed (WAL mode allows concurrent reads)."""
+        return await self._submit_read(self.get_token_info, token_address)
 
     async def async_get_pending_wallets(self, min_hours_since_check: int = 12) -> List[str]:
-        """Async version of get_pending_wallets - runs in thread pool. No lock needed (WAL mode allows concurrent reads)."""
-        return await asyncio.to_thread(self.get_pending_wallets, min_hours_since_check)
+        """Async version of get_pending_wallets - runs on the reader executor. No lock needed (WAL mode allows concurrent reads)."""
+        return await self._submit_read(self.get_pending_wallets, min_hours_since_check)
 
     async def async_get_top_alpha_wallets(self, min_token_overlap: int = 2) -> List[Dict]:
-        """Async version of get_top_alpha_wallets - runs in thread pool. No lock needed (WAL mode allows concurrent reads)."""
-        return await asyncio.to_thread(self.get_top_alpha_wallets, min_token_overlap)
+        """Async version of get_top_alpha_wallets - runs on the reader executor. No lock needed (WAL mode allows concurrent reads)."""
+        return await self._submit_read(self.get_top_alpha_wallets, min_token_overlap)
 
     async def async_save_wallet_portfolio(self, wallet_address: str, trades: List[Dict]):
-        """Async version of save_wallet_portfolio - runs in thread pool."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.save_wallet_portfolio, wallet_address, trades)
+        """Async version of save_wallet_portfolio - runs on the writer thread."""
+        return await self._submit_write(self.save_wallet_portfolio, wallet_address, trades)
 
     async def async_get_wallet_portfolio(self, wallet_address: str, min_pnl: float = 1000):
-        """Async version of get_wallet_portfolio - runs in thread pool. No lock needed (WAL mode allows concurrent reads)."""
-        return await asyncio.to_thread(self.get_wallet_portfolio, wallet_address, min_pnl)
+        """Async version of get_wallet_portfolio - runs on the reader executor. No lock needed (WAL mode allows concurrent reads)."""
+        return await self._submit_read(self.get_wallet_portfolio, wallet_address, min_pnl)
 
     async def async_get_all_wallets(self) -> List[str]:
         """Get ALL wallet addresses from the database, excluding bots. No lock needed (WAL mode allows concurrent reads)."""
         def _get_all():
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT w.address FROM wallets w
-                LEFT JOIN bots b ON w.id = b.wallet_id
-                WHERE b.id IS NULL
-                ORDER BY w.id
-            ''')
-            return [row[0] for row in cursor.fetchall()]
-        
-        return await asyncio.to_thread(_get_all)
+            with self._borrow_read_conn() as conn:
+                cursor = conn.cursor()
+                # Index-only scan of the partial idx_wallets_active (already in id order)
+                cursor.execute('SELECT address FROM wallets WHERE is_bot = 0 ORDER BY id')
+                return _fetch_first_column(cursor)
+        
+        return await self._submit_read(_get_all)
     
     async def async_mark_as_bot(self, wallet_address: str, reason: str = "over 5k trades"):
         """Async version of mark_as_bot."""
-        async with self._db_async_write_lock:
-            return await asyncio.to_thread(self.mark_as_bot, wallet_address, reason)
+        return await self._submit_write(self.mark_as_bot, wallet_address, reason)
+
+    async def async_optimize(self):
+        """Async version of optimize - runs on the writer thread."""
+        return await self._submit_write(self.optimize)
+
+    def start_optimize_task(self, interval: Optional[float] = None) -> asyncio.Task:
+        """
+        Run PRAGMA optimize every `interval` seconds (default SQLITE_OPTIMIZE_INTERVAL)
+        for as long as the returned task lives. Cancel it when shutting down.
+        """
+        if interval is None:
+            interval = config.SQLITE_OPTIMIZE_INTERVAL
+
+        async def _schedule():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.async_optimize()
+                except sqlite3.Error as e:
+                    get_logger().warning("PRAGMA optimize failed: %s", e)
+
+        return asyncio.create_task(_schedule())
 
     async def async_get_all_token_addresses(self) -> List[str]:
         """Get ALL processed token addresses from the database. No lock needed (WAL mode allows concurrent reads)."""
         def _get_all():
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT address FROM tokens')
-            return [row[0] for row in cursor.fetchall()]
+            with self._borrow_read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT address FROM tokens')
+                return _fetch_first_column(cursor)
         
-        return await asyncio.to_thread(_get_all)
+        return await self._submit_read(_get_all)
@@ -6,14 +6,32 @@ Properly deduplicates wallets while showing all their token discoveries.
 
 import sqlite3
 import os
+import re
+import gzip
 import json
+import heapq
+import math
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from itertools import repeat
+from typing import List, Dict, Iterator, Optional, Tuple
 from pathlib import Path
 
 import config
 from logger import get_logger
 
+# Optional fast JSON encoder (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional CSS minifier for the inlined stylesheet (falls back to a regex pass)
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
 # --- CONFIGURATION (from centralized config) ---
 DB_PATH = str(config.DB_PATH)
 OUTPUT_FILE = str(config.REPORT_OUTPUT_PATH)
@@ -22,139 +40,34 @@ MIN_TRADES = config.MIN_TRADES_THRESHOLD
 MIN_HIGH_PROFIT_TOKENS = config.MIN_HIGH_PROFIT_TOKENS
 MIN_TOKEN_PNL_FOR_COUNT = config.MIN_TOKEN_PNL_FOR_COUNT
 
+# Profitable tokens shown per wallet card (the rest are only counted)
+TOP_DISCOVERIES = 5
 
-def fetch_all_audited_wallets(min_capture_date: str = None) -> List[Dict]:
-    """
-    Fetch all wallets that have been audited, without hardcoded thresholds.
-    Returns a list of wallets with their token discoveries.
-    Uses a single JOIN query for optimal performance.
-    """
-    if not os.path.exists(DB_PATH):
-        raise FileNotFoundError(f"Database '{DB_PATH}' not found.")
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Single query with LEFT JOIN to get wallets and their portfolio in one go
-        date_filter = ""
-        params = []
-        
-        if min_capture_date:
-            date_filter = "AND cs.captured_at >= ?"
-            params.append(min_capture_date)
-            
-        print("📊 Fetching all audited wallets and portfolio data from database...")
-        
-        # Single optimized query with LEFT JOIN
-        cursor.execute(f'''
-            SELECT 
-                w.id,
-                w.address,
-                cs.pnl_usd as global_pnl,
-                cs.trades_30d as global_trades,
-                cs.captured_at,
-                wp.symbol,
-                wp.token_address,
-                wp.pnl_usd as token_pnl,
-                wp.num_swaps
-            FROM wallets w
-            JOIN cielo_stats cs ON w.id = cs.wallet_id
-            LEFT JOIN wallet_portfolio wp ON w.id = wp.wallet_id
-            WHERE cs.id IN (SELECT MAX(id) FROM cielo_stats GROUP BY wallet_id)
-            {date_filter}
-            ORDER BY w.id, wp.pnl_usd DESC
-        ''', params)
-        
-        # Build wallet objects from the joined results
-        wallets_dict = {}
-        
-        for row in cursor.fetchall():
-            wid, address, pnl, trades, cap_at, symbol, token_addr, token_pnl, swaps = row
-            
-            # Create wallet entry if not exists
-            if wid not in wallets_dict:
-                wallets_dict[wid] = {
-                    'address': address,
-                    'global_pnl': pnl or 0,
-                    'global_trades': trades or 0,
-                    'captured_at': cap_at,
-                    'discoveries': []
-                }
-            
-            # Add portfolio item if exists (LEFT JOIN may have NULL portfolio)
-            if symbol is not None:
-                wallets_dict[wid]['discoveries'].append({
-                    'symbol': symbol,
-                    'pnl_on_token': token_pnl,
-                    'address': token_addr,
-                    'swaps': swaps
-                })
-        
-        # Convert to list and sort by PnL descending
-        all_results = list(wallets_dict.values())
-        all_results.sort(key=lambda x: x['global_pnl'], reverse=True)
-        
-        print(f"   ✅ Loaded {len(all_results)} wallets with portfolio data")
-        return all_results
-        
-    finally:
-        conn.close()
+# Joined rows pulled from SQLite per fetchmany() call while building wallets
+FETCH_BATCH_SIZE = 10000
 
+# Wallet fields shipped to the page, one JSON array per field (see loadWallets in the page script)
+WALLET_COLUMNS = ('address', 'global_pnl', 'global_pnl_str', 'global_trades', 'captured_at', 'top_discoveries', 'remaining_profitable')
 
-def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
-    """Generate the elite wallets HTML report.
-    
-    Args:
-        min_capture_date: Optional date string to filter wallets from that date onwards.
-        report_type: 'ALL' for full dump, 'SESSION' for dated report.
-    """
-    try:
-        wallets = fetch_all_audited_wallets(min_capture_date=min_capture_date)
-    except FileNotFoundError as error:
-        print(f"❌ Error: {error}")
-        return
-    except sqlite3.Error as error:
-        print(f"❌ Database error: {error}")
-        return
-    
-    if not wallets:
-        print("ℹ️ No audited wallets found in database.")
-        return
 
-    # Determine filename and banner based on report type
-    today_str = datetime.now().strftime("%Y-%m-%d")
-    
-    if report_type == 'ALL':
-        filename = "wallet-stats-all.html"
-        banner_html = f"""
-            <div style="background: linear-gradient(90deg, #d29922 0%, #9e6a03 100%); color: #0d1117; padding: 10px; text-align: center; font-weight: bold; border-radius: 8px; margin-bottom: 20px;">
-                ⚠️ FULL DATABASE EXPORT • All {len(wallets)} tracked wallets • {today_str}
-            </div>
-        """
-    else:
-        filename = f"wallet-stats-{today_str}.html"
-        banner_html = f"""
-            <div style="background: linear-gradient(90deg, #3fb950 0%, #2ea043 100%); color: #0d1117; padding: 10px; text-align: center; font-weight: bold; border-radius: 8px; margin-bottom: 20px;">
-                📅 SESSION REPORT • {today_str} • {len(wallets)} wallets
-            </div>
-        """
-
-    output_path = config.DATA_DIR / filename
-    
-    # Convert wallets to JSON for client-side filtering
-    wallets_json = json.dumps(wallets)
-
-    # Build the HTML
-    html = f"""
+# --- HTML TEMPLATE ---
+# Parts with {{ name }} placeholders are compiled once at import (see compile_template), so their
+# CSS/JS braces need no escaping. Static parts of the report page. generate_html writes them around the minified stylesheet,
+# the banner, the wallet count and summary (MID_HTML's {{ wallet_count }}/{{ summary_json }}) and the
+# streamed walletColumns (or null, with the columns fetched from the .json.gz data file), then the
+# minified page script and one of the *_END_HTML parts.
+HEAD_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Wallet Intelligence Dashboard</title>
-        <style>
-            :root {{
+        <style>"""
+
+# Stylesheet source, inlined minified (STYLE_MIN) between HEAD_HTML and BODY_OPEN_HTML
+REPORT_CSS = """
+            :root {
                 --bg: #0b0f19;
                 --card-bg: #161b22;
                 --text: #c9d1d9;
@@ -165,21 +78,21 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 --danger: #f85149;
                 --muted: #8b949e;
                 --input-bg: rgba(255, 255, 255, 0.05);
-            }}
-            body {{
+            }
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif;
                 background-color: var(--bg);
                 color: var(--text);
                 margin: 0;
                 padding: 40px;
                 line-height: 1.5;
-            }}
-            .container {{ max-width: 1400px; margin: 0 auto; }}
-            h1 {{ font-size: 2rem; color: #f0f6fc; margin-bottom: 5px; }}
-            .subtitle {{ color: #8b949e; margin-bottom: 30px; }}
+            }
+            .container { max-width: 1400px; margin: 0 auto; }
+            h1 { font-size: 2rem; color: #f0f6fc; margin-bottom: 5px; }
+            .subtitle { color: #8b949e; margin-bottom: 30px; }
             
             /* SUMMARY BOX */
-            .summary {{
+            .summary {
                 background: var(--card-bg);
                 border: 1px solid var(--border);
                 border-radius: 12px;
@@ -188,13 +101,13 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 display: flex;
                 gap: 60px;
                 box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-            }}
-            .summary-stat {{ text-align: left; flex: 1; }}
-            .summary-value {{ font-size: 28px; font-weight: bold; color: #f0f6fc; font-family: 'JetBrains Mono', monospace; }}
-            .summary-label {{ color: var(--muted); font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin-top: 4px; }}
+            }
+            .summary-stat { text-align: left; flex: 1; }
+            .summary-value { font-size: 28px; font-weight: bold; color: #f0f6fc; font-family: 'JetBrains Mono', monospace; }
+            .summary-label { color: var(--muted); font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px; margin-top: 4px; }
 
             /* FILTER BAR */
-            .filters-container {{
+            .filters-container {
                 background: var(--card-bg);
                 border: 1px solid var(--border);
                 border-radius: 12px;
@@ -209,20 +122,20 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 z-index: 100;
                 box-shadow: 0 8px 24px rgba(0,0,0,0.5);
                 backdrop-filter: blur(10px);
-            }}
-            .filter-group {{
+            }
+            .filter-group {
                 display: flex;
                 flex-direction: column;
                 gap: 8px;
-            }}
-            .filter-group label {{
+            }
+            .filter-group label {
                 font-size: 11px;
                 font-weight: bold;
                 color: var(--muted);
                 text-transform: uppercase;
                 letter-spacing: 0.5px;
-            }}
-            .filter-input {{
+            }
+            .filter-input {
                 background: var(--input-bg);
                 border: 1px solid var(--border);
                 border-radius: 8px;
@@ -231,85 +144,85 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 font-size: 14px;
                 width: 160px;
                 transition: all 0.2s;
-            }}
-            .filter-input:focus {{
+            }
+            .filter-input:focus {
                 outline: none;
                 border-color: var(--accent);
                 background: rgba(255, 255, 255, 0.1);
                 box-shadow: 0 0 0 3px rgba(88, 166, 255, 0.1);
-            }}
-            .search-input {{ width: 300px; }}
+            }
+            .search-input { width: 300px; }
             
-            .visible-counter {{
+            .visible-counter {
                 margin-left: auto;
                 text-align: right;
                 background: rgba(88, 166, 255, 0.1);
                 padding: 10px 20px;
                 border-radius: 8px;
                 border: 1px solid rgba(88, 166, 255, 0.2);
-            }}
-            .visible-count {{ font-size: 22px; font-weight: bold; color: var(--accent); }}
-            .visible-label {{ color: var(--muted); font-size: 11px; text-transform: uppercase; }}
+            }
+            .visible-count { font-size: 22px; font-weight: bold; color: var(--accent); }
+            .visible-label { color: var(--muted); font-size: 11px; text-transform: uppercase; }
 
             /* WALLET CARDS */
-            #wallets-list {{
-                display: flex;
-                flex-direction: column;
-                gap: 20px;
-            }}
-            .wallet-card {{
+            /* Virtualized: sized to the whole filtered list, only cards near the viewport are attached */
+            #wallets-list { position: relative; }
+            .wallet-card {
+                position: absolute;
+                left: 0;
+                right: 0;
                 background: var(--card-bg);
                 border: 1px solid var(--border);
                 border-radius: 12px;
                 overflow: hidden;
                 transition: all 0.2s;
                 animation: fadeIn 0.4s ease-out;
-            }}
-            @keyframes fadeIn {{
-                from {{ opacity: 0; transform: translateY(10px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            .wallet-card:hover {{ 
+            }
+            @keyframes fadeIn {
+                from { opacity: 0; transform: translateY(10px); }
+                to { opacity: 1; transform: translateY(0); }
+            }
+            .wallet-card:hover { 
                 border-color: #58a6ff66; 
                 transform: translateY(-2px);
                 box-shadow: 0 4px 20px rgba(0,0,0,0.4);
-            }}
+            }
             
-            .wallet-header {{
+            .wallet-header {
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
                 padding: 20px 25px;
                 background: #0d1117;
                 border-bottom: 1px solid var(--border);
-            }}
-            .wallet-address-container {{
+            }
+            .wallet-address-container {
                 display: flex;
                 flex-direction: column;
                 gap: 4px;
-            }}
-            .wallet-address {{
+            }
+            .wallet-address {
                 font-family: 'JetBrains Mono', monospace;
                 color: var(--accent);
                 font-size: 15px;
                 text-decoration: none;
                 font-weight: 600;
-            }}
-            .wallet-address:hover {{ text-decoration: underline; }}
-            .capture-date {{ font-size: 11px; color: var(--muted); }}
+            }
+            .wallet-address:hover { text-decoration: underline; }
+            .capture-date { font-size: 11px; color: var(--muted); }
             
-            .wallet-stats {{ display: flex; gap: 40px; }}
-            .stat {{ text-align: right; }}
-            .stat-value {{
+            .wallet-stats { display: flex; gap: 40px; }
+            .stat { text-align: right; }
+            .stat-value {
                 color: var(--success);
                 font-weight: bold;
                 font-size: 18px;
                 font-family: 'JetBrains Mono', monospace;
-            }}
-            .stat-label {{ color: var(--muted); font-size: 11px; text-transform: uppercase; letter-spacing: 0.5px; }}
+            }
+            .stat-label { color: var(--muted); font-size: 11px; text-transform: uppercase; letter-spacing: 0.5px; }
             
-            .wallet-links {{ display: flex; gap: 12px; }}
-            .wallet-links a {{
+            .wallet-links { display: flex; gap: 12px; }
+            .wallet-links a {
                 color: var(--text);
                 text-decoration: none;
                 font-size: 12px;
@@ -319,20 +232,20 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 background: rgba(255, 255, 255, 0.03);
                 transition: all 0.2s;
                 font-weight: 500;
-            }}
-            .wallet-links a:hover {{ 
+            }
+            .wallet-links a:hover { 
                 background: var(--accent); 
                 color: white; 
                 border-color: var(--accent);
-            }}
+            }
 
             /* TABLE STYLES */
-            .tokens-table {{
+            .tokens-table {
                 width: 100%;
                 border-collapse: collapse;
                 font-size: 14px;
-            }}
-            .tokens-table th {{
+            }
+            .tokens-table th {
                 text-align: left;
                 padding: 15px 25px;
                 color: var(--muted);
@@ -342,22 +255,22 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 font-size: 11px;
                 text-transform: uppercase;
                 letter-spacing: 1px;
-            }}
-            .tokens-table td {{
+            }
+            .tokens-table td {
                 padding: 14px 25px;
                 border-bottom: 1px solid #21262d;
-            }}
-            .tokens-table tr:last-child td {{ border-bottom: none; }}
+            }
+            .tokens-table tr:last-child td { border-bottom: none; }
             
-            .col-token {{ font-weight: 600; color: #f0f6fc; }}
-            .col-pnl {{ font-family: 'JetBrains Mono', monospace; text-align: right; }}
-            .col-swaps {{ text-align: center; color: var(--muted); width: 120px; }}
-            .col-link {{ text-align: right; width: 150px; }}
+            .col-token { font-weight: 600; color: #f0f6fc; }
+            .col-pnl { font-family: 'JetBrains Mono', monospace; text-align: right; }
+            .col-swaps { text-align: center; color: var(--muted); width: 120px; }
+            .col-link { text-align: right; width: 150px; }
 
-            .pnl-pos {{ color: var(--success); }}
-            .pnl-neg {{ color: var(--danger); }}
+            .pnl-pos { color: var(--success); }
+            .pnl-neg { color: var(--danger); }
             
-            .token-link {{
+            .token-link {
                 color: var(--accent);
                 text-decoration: none;
                 font-size: 11px;
@@ -367,13 +280,13 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 border: 1px solid rgba(88, 166, 255, 0.2);
                 border-radius: 4px;
                 transition: all 0.2s;
-            }}
-            .token-link:hover {{ 
+            }
+            .token-link:hover { 
                 background: rgba(88, 166, 255, 0.1);
                 border-color: var(--accent);
-            }}
+            }
             
-            .more-tokens-btn {{
+            .more-tokens-btn {
                 width: 100%;
                 padding: 15px;
                 background: rgba(255,255,255,0.02);
@@ -383,54 +296,40 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
                 font-size: 12px;
                 cursor: pointer;
                 transition: all 0.2s;
-            }}
-            .more-tokens-btn:hover {{ background: rgba(255,255,255,0.05); color: var(--text); }}
+            }
+            .more-tokens-btn:hover { background: rgba(255,255,255,0.05); color: var(--text); }
 
-            /* PAGINATION */
-            .load-more-container {{
-                text-align: center;
-                padding: 40px;
-                margin-top: 20px;
-            }}
-            .load-more-btn {{
-                background: var(--accent);
-                color: white;
-                border: none;
-                padding: 15px 40px;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: 600;
-                cursor: pointer;
-                transition: transform 0.2s, background 0.2s;
-                box-shadow: 0 4px 12px rgba(88, 166, 255, 0.3);
-            }}
-            .load-more-btn:hover {{ 
-                transform: translateY(-2px);
-                background: #79c0ff;
-            }}
-            .load-more-btn:disabled {{
-                background: var(--border);
-                cursor: not-allowed;
-                transform: none;
-                box-shadow: none;
-            }}
-
-            @media (max-width: 1200px) {{
-                .summary {{ gap: 20px; flex-wrap: wrap; }}
-                .filters-container {{ top: 10px; padding: 15px; }}
-                .search-input {{ width: 100%; order: -1; }}
-                .filter-input {{ width: 100px; }}
-            }}
-        </style>
+            @media (max-width: 1200px) {
+                .summary { gap: 20px; flex-wrap: wrap; }
+                .filters-container { top: 10px; padding: 15px; }
+                .search-input { width: 100%; order: -1; }
+                .filter-input { width: 100px; }
+            }
+"""
+
+BODY_OPEN_HTML = """</style>
     </head>
     <body>
         <div class="container">
-            {banner_html}
+            """
+
+MID_HTML = """
             <h1>🕵️ Terminal Wallet Intelligence</h1>
-            <p class="subtitle">Complete audited wallet database. Total records: {len(wallets)}</p>
+            <p class="subtitle">Complete audited wallet database. Total records: {{ wallet_count }}</p>
             
             <div id="summary-container" class="summary">
-                <!-- Dynamic Summary -->
+                <div class="summary-stat">
+                    <div id="summary-count" class="summary-value"></div>
+                    <div class="summary-label">Wallets Found</div>
+                </div>
+                <div class="summary-stat">
+                    <div id="summary-pnl" class="summary-value"></div>
+                    <div class="summary-label">Combined Profit</div>
+                </div>
+                <div class="summary-stat">
+                    <div id="summary-profitable" class="summary-value"></div>
+                    <div class="summary-label">Profitable Wallets</div>
+                </div>
             </div>
 
             <div class="filters-container">
@@ -455,180 +354,793 @@ def generate_html(min_capture_date: str = None, report_type: str = 'SESSION'):
             <div id="wallets-list">
                 <!-- Dynamic Wallet Cards -->
             </div>
+        </div>
 
-            <div class="load-more-container">
-                <button id="load-more" class="load-more-btn">Load More Wallets</button>
+        <!-- Pre-parsed markup, cloned by buildWalletCard (cards, token rows) and updateView (empty list) -->
+        <template id="wallet-tpl">
+            <div class="wallet-card">
+                <div class="wallet-header">
+                    <div class="wallet-address-container">
+                        <a target="_blank" class="wallet-address"></a>
+                        <div class="capture-date"></div>
+                    </div>
+                    <div class="wallet-stats">
+                        <div class="stat">
+                            <div class="stat-value wallet-pnl"></div>
+                            <div class="stat-label">30d PnL</div>
+                        </div>
+                        <div class="stat">
+                            <div class="stat-value wallet-trades"></div>
+                            <div class="stat-label">Total Trades</div>
+                        </div>
+                    </div>
+                    <div class="wallet-links">
+                        <a target="_blank" class="link-gmgn">GMGN</a>
+                        <a target="_blank" class="link-cielo">Cielo</a>
+                    </div>
+                </div>
+                <table class="tokens-table">
+                    <thead>
+                        <tr>
+                            <th>Token</th>
+                            <th style="text-align: right">Realized PnL</th>
+                            <th style="text-align: center">Activity</th>
+                            <th></th>
+                        </tr>
+                    </thead>
+                    <tbody></tbody>
+                </table>
+                <button class="more-tokens-btn"></button>
             </div>
-        </div>
+        </template>
+        <template id="token-row-tpl">
+            <tr>
+                <td class="col-token"></td>
+                <td class="col-pnl"></td>
+                <td class="col-swaps"></td>
+                <td class="col-link">
+                    <a target="_blank" class="token-link">View Token</a>
+                </td>
+            </tr>
+        </template>
+        <template id="no-wallets-tpl">
+            <div style="text-align: center; padding: 100px; color: var(--muted);">No wallets matching your filters</div>
+        </template>
+        <template id="no-tokens-tpl">
+            <tr><td colspan="4" style="text-align: center; color: var(--muted); padding: 20px;">No profitable trades found in 30d history</td></tr>
+        </template>
 
         <script>
-            const allWallets = {wallets_json};
-            let filteredWallets = [];
-            let currentDisplayLimit = 50;
-            const CHUNK_SIZE = 50;
+            const allSummary = {{ summary_json }};
+            const walletColumns = """
+
+# Page script source (after the inlined walletColumns), written minified as SCRIPT_MIN
+REPORT_JS = """;
+            // Wallets are stored column-wise (struct of arrays): numeric columns live in typed
+            // arrays and every filtered view is an Int32Array of row indices into them
+            let addrs = [];
+            let lowerAddrs = [];
+            let addrIndex = new Map();
+            let pnl = new Float64Array(0);
+            let pnlStr = [];
+            let trades = new Int32Array(0);
+            let capturedAt = [];
+            let topDiscoveries = [];
+            let tokenPool = [];
+            let remainingProfitable = new Int32Array(0);
+            let allIndices = new Int32Array(0);
+            let filteredWallets = allIndices;
+            const FILTER_DEBOUNCE_MS = 150;
+
+            // The list is virtualized: cards are absolutely positioned at offsets[k] (k = position in
+            // filteredWallets) and only those within OVERSCAN_PX of the viewport are in the DOM.
+            // Heights start as estimates and are replaced by measured ones as cards get rendered.
+            const CARD_GAP = 20;
+            const CARD_BASE_HEIGHT = 130;
+            const TOKEN_ROW_HEIGHT = 50;
+            const MORE_BUTTON_HEIGHT = 46;
+            const OVERSCAN_PX = 800;
+            let cardHeights = new Float64Array(0);
+            let offsets = new Float64Array(1);
+            const renderedCards = new Map();
+            const cardWallet = new WeakMap();
+            let windowScheduled = false;
             
             const searchInput = document.getElementById('search-addr');
             const minPnlInput = document.getElementById('min-pnl');
             const minTradesInput = document.getElementById('min-trades');
             const walletsList = document.getElementById('wallets-list');
             const visibleCountEl = document.getElementById('visible-count');
-            const summaryContainer = document.getElementById('summary-container');
-            const loadMoreBtn = document.getElementById('load-more');
-
-            function formatCurrency(val) {{
-                return new Intl.NumberFormat('en-US', {{
-                    style: 'currency',
-                    currency: 'USD',
-                    maximumFractionDigits: 0
-                }}).format(val);
-            }}
-
-            function filterWallets() {{
+            const summaryCountEl = document.getElementById('summary-count');
+            const summaryPnlEl = document.getElementById('summary-pnl');
+            const summaryProfitableEl = document.getElementById('summary-profitable');
+            const walletTpl = document.getElementById('wallet-tpl').content;
+            const tokenRowTpl = document.getElementById('token-row-tpl').content;
+            const noTokensTpl = document.getElementById('no-tokens-tpl').content;
+            const noWalletsTpl = document.getElementById('no-wallets-tpl').content;
+
+            // One formatter for the page; building an Intl.NumberFormat is far costlier than using it
+            const CURRENCY_FMT = new Intl.NumberFormat('en-US', {
+                style: 'currency',
+                currency: 'USD',
+                maximumFractionDigits: 0
+            });
+
+            function formatCurrency(val) {
+                return CURRENCY_FMT.format(val);
+            }
+
+            // Takes the {column: [values]} object written by generate_report.py
+            function loadWallets(columns) {
+                addrs = columns.address;
+                // Lowercased addresses and an exact-address lookup for search, built once
+                lowerAddrs = addrs.map(addr => addr.toLowerCase());
+                addrIndex = new Map(lowerAddrs.map((addr, i) => [addr, i]));
+                pnl = Float64Array.from(columns.global_pnl);
+                pnlStr = columns.global_pnl_str;
+                trades = Int32Array.from(columns.global_trades);
+                capturedAt = columns.captured_at;
+                topDiscoveries = columns.top_discoveries;
+                tokenPool = columns.tokens;
+                remainingProfitable = Int32Array.from(columns.remaining_profitable);
+                allIndices = Int32Array.from(addrs.keys());
+                cardHeights = new Float64Array(addrs.length);
+            }
+
+            function filterWallets() {
                 const search = searchInput.value.toLowerCase().trim();
                 const minPnl = parseFloat(minPnlInput.value) || -Infinity;
                 const minTrades = parseInt(minTradesInput.value) || 0;
 
-                filteredWallets = allWallets.filter(w => {{
-                    const matchesSearch = !search || w.address.toLowerCase().includes(search);
-                    return matchesSearch && w.global_pnl >= minPnl && w.global_trades >= minTrades;
-                }});
+                const unfiltered = !search && minPnl === -Infinity && minTrades === 0;
+                if (unfiltered) {
+                    filteredWallets = allIndices;
+                } else {
+                    const matches = [];
+                    // A pasted full address (32+ chars) is a single lookup; anything else scans the columns
+                    const exact = search.length >= 32 ? addrIndex.get(search) : undefined;
+                    if (exact !== undefined) {
+                        if (pnl[exact] >= minPnl && trades[exact] >= minTrades) matches.push(exact);
+                    } else {
+                        for (let i = 0; i < pnl.length; i++) {
+                            if (pnl[i] >= minPnl && trades[i] >= minTrades && (!search || lowerAddrs[i].includes(search))) {
+                                matches.push(i);
+                            }
+                        }
+                    }
+                    filteredWallets = Int32Array.from(matches);
+                }
 
-                currentDisplayLimit = CHUNK_SIZE;
+                // Totals for the full list are precomputed in Python; filtered views take one pass
+                renderSummary(unfiltered ? allSummary : summarize(filteredWallets));
                 updateView();
-            }}
+            }
 
-            function updateView() {{
-                renderSummary(filteredWallets);
-                renderWallets(filteredWallets.slice(0, currentDisplayLimit));
+            function updateView() {
                 visibleCountEl.textContent = filteredWallets.length;
-                
-                if (currentDisplayLimit >= filteredWallets.length) {{
-                    loadMoreBtn.style.display = 'none';
-                }} else {{
-                    loadMoreBtn.style.display = 'inline-block';
-                }}
-            }}
-
-            function loadMore() {{
-                currentDisplayLimit += CHUNK_SIZE;
-                updateView();
-            }}
+                cardObserver.disconnect();
+                renderedCards.clear();
 
-            function renderSummary(data) {{
-                const totalPnl = data.reduce((sum, w) => sum + (w.global_pnl || 0), 0);
-                const profWallets = data.filter(w => w.global_pnl > 0).length;
+                if (filteredWallets.length === 0) {
+                    walletsList.style.height = '';
+                    walletsList.replaceChildren(noWalletsTpl.cloneNode(true));
+                    return;
+                }
 
-                summaryContainer.innerHTML = `
-                    <div class="summary-stat">
-                        <div class="summary-value">${{data.length.toLocaleString()}}</div>
-                        <div class="summary-label">Wallets Found</div>
-                    </div>
-                    <div class="summary-stat">
-                        <div class="summary-value">${{formatCurrency(totalPnl)}}</div>
-                        <div class="summary-label">Combined Profit</div>
-                    </div>
-                    <div class="summary-stat">
-                        <div class="summary-value">${{profWallets}}</div>
-                        <div class="summary-label">Profitable Wallets</div>
-                    </div>
-                `;
-            }}
+                walletsList.replaceChildren();
+                layoutList();
+                renderWindow();
+            }
 
-            function renderWallets(data) {{
-                if (data.length === 0) {{
-                    walletsList.innerHTML = '<div style="text-align: center; padding: 100px; color: var(--muted);">No wallets matching your filters</div>';
-                    return;
-                }}
-
-                walletsList.innerHTML = data.map(wallet => {{
-                    const addr = wallet.address;
-                    const cieloUrl = `https://app.cielo.finance/profile/${{addr}}?timeframe=30d&sortBy=pnl_desc`;
-                    const gmgnUrl = `https://gmgn.ai/sol/address/${{addr}}`;
-                    
-                    // Show top 5 profitable tokens initially
-                    const topTokens = wallet.discoveries
-                        .filter(d => d.pnl_on_token >= 0)
-                        .slice(0, 5);
-                    
-                    let tableRows = topTokens.map(t => {{
-                        const pnlClass = t.pnl_on_token >= 0 ? "pnl-pos" : "pnl-neg";
-                        return `
-                            <tr>
-                                <td class="col-token">${{t.symbol}}</td>
-                                <td class="col-pnl ${{pnlClass}}">${{formatCurrency(t.pnl_on_token)}}</td>
-                                <td class="col-swaps">${{t.swaps || '-'}} swaps</td>
-                                <td class="col-link">
-                                    <a href="https://gmgn.ai/sol/token/${{t.address}}" target="_blank" class="token-link">View Token</a>
-                                </td>
-                            </tr>
-                        `;
-                    }}).join('');
-
-                    if (!tableRows) {{
-                        tableRows = '<tr><td colspan="4" style="text-align: center; color: var(--muted); padding: 20px;">No profitable trades found in 30d history</td></tr>';
-                    }}
-
-                    const remaining = wallet.discoveries.filter(d => d.pnl_on_token >= 0).length - 5;
-
-                    return `
-                        <div class="wallet-card">
-                            <div class="wallet-header">
-                                <div class="wallet-address-container">
-                                    <a href="${{cieloUrl}}" target="_blank" class="wallet-address">${{addr}}</a>
-                                    <div class="capture-date">Last Audit: ${{wallet.captured_at}}</div>
-                                </div>
-                                <div class="wallet-stats">
-                                    <div class="stat">
-                                        <div class="stat-value ${{wallet.global_pnl >= 0 ? 'pnl-pos' : 'pnl-neg'}}">
-                                            ${{formatCurrency(wallet.global_pnl)}}
-                                        </div>
-                                        <div class="stat-label">30d PnL</div>
-                                    </div>
-                                    <div class="stat">
-                                        <div class="stat-value">${{wallet.global_trades}}</div>
-                                        <div class="stat-label">Total Trades</div>
-                                    </div>
-                                </div>
-                                <div class="wallet-links">
-                                    <a href="${{gmgnUrl}}" target="_blank">GMGN</a>
-                                    <a href="${{cieloUrl}}" target="_blank">Cielo</a>
-                                </div>
-                            </div>
-                            <table class="tokens-table">
-                                <thead>
-                                    <tr>
-                                        <th>Token</th>
-                                        <th style="text-align: right">Realized PnL</th>
-                                        <th style="text-align: center">Activity</th>
-                                        <th></th>
-                                    </tr>
-                                </thead>
-                                <tbody>${{tableRows}}</tbody>
-                            </table>
-                            ${{remaining > 0 ? `<button class="more-tokens-btn" onclick="window.open('${{cieloUrl}}', '_blank')">View ${{remaining}} more profitable trades on Cielo ↗</button>` : ''}}
-                        </div>
-                    `;
-                }}).join('');
-            }}
+            function summarize(indices) {
+                let totalPnl = 0;
+                let profitable = 0;
+                for (const i of indices) {
+                    totalPnl += pnl[i];
+                    if (pnl[i] > 0) profitable++;
+                }
+                return { count: indices.length, total_pnl: totalPnl, profitable: profitable };
+            }
+
+            function renderSummary(summary) {
+                summaryCountEl.textContent = summary.count.toLocaleString();
+                summaryPnlEl.textContent = formatCurrency(summary.total_pnl);
+                summaryProfitableEl.textContent = summary.profitable;
+            }
+
+            function estimateCardHeight(i) {
+                const rows = Math.max(topDiscoveries[i].length, 1);
+                return CARD_BASE_HEIGHT + rows * TOKEN_ROW_HEIGHT + (remainingProfitable[i] > 0 ? MORE_BUTTON_HEIGHT : 0);
+            }
+
+            // Prefix sums of card heights over the filtered list; sizes the list to hold all of it
+            function layoutList() {
+                const count = filteredWallets.length;
+                offsets = new Float64Array(count + 1);
+                for (let k = 0; k < count; k++) {
+                    const i = filteredWallets[k];
+                    offsets[k + 1] = offsets[k] + (cardHeights[i] || estimateCardHeight(i)) + CARD_GAP;
+                }
+                walletsList.style.height = `${Math.max(offsets[count] - CARD_GAP, 0)}px`;
+            }
+
+            function scheduleWindow() {
+                if (windowScheduled) return;
+                windowScheduled = true;
+                requestAnimationFrame(renderWindow);
+            }
+
+            // Attach the cards overlapping the viewport (plus overscan) and drop the rest
+            function renderWindow() {
+                windowScheduled = false;
+                const count = filteredWallets.length;
+                if (count === 0) return;
+
+                const listTop = walletsList.getBoundingClientRect().top;
+                const viewStart = -listTop - OVERSCAN_PX;
+                const viewEnd = -listTop + window.innerHeight + OVERSCAN_PX;
+
+                // Binary search for the first card whose bottom edge is below viewStart
+                let lo = 0;
+                let hi = count - 1;
+                while (lo < hi) {
+                    const mid = (lo + hi) >> 1;
+                    if (offsets[mid + 1] <= viewStart) lo = mid + 1;
+                    else hi = mid;
+                }
+                const start = lo;
+                let end = start + 1;
+                while (end < count && offsets[end] < viewEnd) end++;
+
+                for (const [k, card] of renderedCards) {
+                    if (k < start || k >= end) {
+                        cardObserver.unobserve(card);
+                        card.remove();
+                        renderedCards.delete(k);
+                    }
+                }
+
+                // Clone pre-parsed templates and fill them via textContent/href (no HTML re-parse);
+                // cards above the already-attached run are prepended so DOM order matches list order
+                const firstAttached = renderedCards.size ? Math.min(...renderedCards.keys()) : end;
+                const before = document.createDocumentFragment();
+                const after = document.createDocumentFragment();
+                for (let k = start; k < end; k++) {
+                    if (renderedCards.has(k)) continue;
+                    const i = filteredWallets[k];
+                    const card = buildWalletCard(i);
+                    card.style.top = `${offsets[k]}px`;
+                    renderedCards.set(k, card);
+                    cardWallet.set(card, i);
+                    cardObserver.observe(card);
+                    (k < firstAttached ? before : after).appendChild(card);
+                }
+                walletsList.prepend(before);
+                walletsList.appendChild(after);
+            }
+
+            // Replace estimated heights with measured ones and shift the attached cards to match
+            const cardObserver = new ResizeObserver(entries => {
+                let changed = false;
+                for (const entry of entries) {
+                    const i = cardWallet.get(entry.target);
+                    const height = entry.target.offsetHeight;
+                    if (i !== undefined && height && height !== cardHeights[i]) {
+                        cardHeights[i] = height;
+                        changed = true;
+                    }
+                }
+                if (!changed) return;
+                layoutList();
+                for (const [k, card] of renderedCards) {
+                    card.style.top = `${offsets[k]}px`;
+                }
+                scheduleWindow();
+            });
+
+            function buildWalletCard(i) {
+                const card = walletTpl.cloneNode(true).firstElementChild;
+                const addr = addrs[i];
+                const cieloUrl = `https://app.cielo.finance/profile/${addr}?timeframe=30d&sortBy=pnl_desc`;
+                const gmgnUrl = `https://gmgn.ai/sol/address/${addr}`;
+
+                const addrLink = card.querySelector('.wallet-address');
+                addrLink.href = cieloUrl;
+                addrLink.textContent = addr;
+                card.querySelector('.capture-date').textContent = `Last Audit: ${capturedAt[i]}`;
+
+                const pnlEl = card.querySelector('.wallet-pnl');
+                pnlEl.classList.add(pnl[i] >= 0 ? 'pnl-pos' : 'pnl-neg');
+                pnlEl.textContent = pnlStr[i];
+                card.querySelector('.wallet-trades').textContent = trades[i];
+                card.querySelector('.link-gmgn').href = gmgnUrl;
+                card.querySelector('.link-cielo').href = cieloUrl;
+
+                // Top profitable tokens, already picked in Python
+                const tbody = card.querySelector('tbody');
+                for (const [tokenId, pnlOnToken, swaps] of topDiscoveries[i]) {
+                    const [symbol, tokenAddress] = tokenPool[tokenId];
+                    const row = tokenRowTpl.cloneNode(true).firstElementChild;
+                    row.querySelector('.col-token').textContent = symbol;
+                    const pnlCell = row.querySelector('.col-pnl');
+                    pnlCell.classList.add(pnlOnToken >= 0 ? 'pnl-pos' : 'pnl-neg');
+                    pnlCell.textContent = formatCurrency(pnlOnToken);
+                    row.querySelector('.col-swaps').textContent = `${swaps || '-'} swaps`;
+                    row.querySelector('.token-link').href = `https://gmgn.ai/sol/token/${tokenAddress}`;
+                    tbody.appendChild(row);
+                }
+                if (topDiscoveries[i].length === 0) {
+                    tbody.appendChild(noTokensTpl.cloneNode(true));
+                }
+
+                const moreBtn = card.querySelector('.more-tokens-btn');
+                const remaining = remainingProfitable[i];
+                if (remaining > 0) {
+                    moreBtn.textContent = `View ${remaining} more profitable trades on Cielo ↗`;
+                    moreBtn.addEventListener('click', () => window.open(cieloUrl, '_blank'));
+                } else {
+                    moreBtn.remove();
+                }
+                return card;
+            }
+
+            // Coalesce bursts of keystrokes: only the last value in each pause gets filtered
+            function debounce(fn, ms) {
+                let timer;
+                return (...args) => {
+                    clearTimeout(timer);
+                    timer = setTimeout(() => fn(...args), ms);
+                };
+            }
 
-            [searchInput, minPnlInput, minTradesInput].forEach(el => {{
-                el.addEventListener('input', filterWallets);
-            }});
+            const debouncedFilter = debounce(filterWallets, FILTER_DEBOUNCE_MS);
+            [searchInput, minPnlInput, minTradesInput].forEach(el => {
+                el.addEventListener('input', debouncedFilter);
+            });
 
-            loadMoreBtn.addEventListener('click', loadMore);
+            window.addEventListener('scroll', scheduleWindow, { passive: true });
+            window.addEventListener('resize', scheduleWindow);
 
-            // Initial Filter & Render
+"""
+
+# Ends the page when walletColumns is inlined: render straight away
+INLINE_END_HTML = """            // Initial Filter & Render
+            loadWallets(walletColumns);
             filterWallets();
         </script>
     </body>
     </html>
     """
 
+# Ends the page when the wallets live in a sibling .json.gz ({{ data_url }}): fetch, then render.
+# Servers that add Content-Encoding: gzip hand back plain JSON; otherwise decompress here.
+EXTERNAL_END_HTML = """            // Load wallets from the compressed data file, then Filter & Render
+            (async () => {
+                const response = await fetch({{ data_url }});
+                const body = response.headers.get('Content-Encoding') === 'gzip'
+                    ? response
+                    : new Response(response.body.pipeThrough(new DecompressionStream('gzip')));
+                loadWallets(await body.json());
+                filterWallets();
+            })();
+        </script>
+    </body>
+    </html>
+    """
+
+
+def minify_css(css: str) -> str:
+    """
+    Minify a stylesheet with rcssmin when installed. The fallback only strips comments and
+    collapses whitespace runs; it never touches punctuation, so strings and attribute
+    selectors keep their meaning.
+    """
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    return re.sub(r'\s+', ' ', css).strip()
+
+
+# Escapes, line comments and the quotes that open or close a JS string
+_JS_TOKEN = re.compile(r"\\.|//|[`'\"]")
+
+
+def _ends_in_template(line: str, in_template: bool) -> bool:
+    """Whether a template literal is still open at the end of this line of JS."""
+    quote = '`' if in_template else None
+    for match in _JS_TOKEN.finditer(line):
+        token = match.group()
+        if token[0] == '\\':
+            continue
+        if quote is None:
+            if token == '//':
+                break
+            quote = token
+        elif token == quote:
+            quote = None
+    return quote == '`'
+
+
+def minify_js(js: str) -> str:
+    """
+    Drop indentation, blank lines and whole-line // comments; line breaks stay so ASI is
+    unaffected. Text inside a multi-line template literal is kept verbatim.
+    """
+    out = []
+    in_template = False
+    for line in js.splitlines():
+        starts_inside = in_template
+        in_template = _ends_in_template(line, in_template)
+        if starts_inside:
+            out.append(line)
+            continue
+        # Trailing whitespace after an opening backtick belongs to the literal
+        line = line.lstrip() if in_template else line.strip()
+        if line and not line.startswith('//'):
+            out.append(line)
+    return '\n'.join(out) + '\n'
+
+
+_PLACEHOLDER = re.compile(r'\{\{ (\w+) \}\}')
+
+
+def compile_template(text: str) -> List[str]:
+    """Split a page part on its {{ name }} placeholders: literal text at even indices, names at odd ones."""
+    return _PLACEHOLDER.split(text)
+
+
+def render_template(parts: List[str], **values) -> Iterator[str]:
+    """Yield a compiled page part piece by piece with each placeholder filled from values."""
+    for index, part in enumerate(parts):
+        yield part if index % 2 == 0 else str(values[part])
+
+
+# Minified and compiled once at import; the readable sources above are what gets edited
+STYLE_MIN = minify_css(REPORT_CSS)
+SCRIPT_MIN = minify_js(REPORT_JS)
+MID_TEMPLATE = compile_template(MID_HTML)
+EXTERNAL_END_TEMPLATE = compile_template(EXTERNAL_END_HTML)
+
+
+def format_usd(value: float) -> str:
+    """Whole-dollar USD string matching the page's formatCurrency (e.g. "$1,234", "-$56")."""
+    # Intl.NumberFormat rounds halves away from zero, where format() would round them to even
+    dollars = math.floor(abs(value) + 0.5)
+    return f"-${dollars:,}" if value < 0 else f"${dollars:,}"
+
+
+def intern_tokens(top_discoveries: List[List[tuple]]) -> List[tuple]:
+    """
+    Replace each discovery's symbol and address with an index into a shared token pool,
+    so tokens held by many wallets are encoded once. Rewrites the discovery lists in place
+    to (token_id, pnl_on_token, swaps) and returns the pool of (symbol, address) pairs.
+    """
+    token_ids = {}
+    pool = []
+    for discoveries in top_discoveries:
+        for position, (symbol, token_pnl, token_addr, swaps) in enumerate(discoveries):
+            key = (symbol, token_addr)
+            token_id = token_ids.get(key)
+            if token_id is None:
+                token_id = token_ids[key] = len(pool)
+                pool.append(key)
+            discoveries[position] = (token_id, token_pnl, swaps)
+    return pool
+
+
+def dumps_json(obj) -> str:
+    """Serialize to a JSON string, using orjson when installed (much faster on the wallet list)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def iter_json_array(items: List) -> Iterator[str]:
+    """Yield a JSON array piece by piece (one encoded item per chunk) for streaming writes."""
+    separator = '['
+    for item in items:
+        yield separator + dumps_json(item)
+        separator = ','
+    yield ']' if separator == ',' else '[]'
+
+
+def iter_json_columns(columns: Dict[str, List]) -> Iterator[str]:
+    """Yield a {key: [value per row]} mapping as one JSON object, piece by piece."""
+    separator = '{'
+    for key, values in columns.items():
+        yield separator + dumps_json(key) + ':'
+        yield from iter_json_array(values)
+        separator = ','
+    yield '}' if separator == ',' else '{}'
+
+
+def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[tuple]:
+    """Yield result rows in fetchmany batches so only one batch of tuples is alive at a time."""
+    cursor.arraysize = FETCH_BATCH_SIZE
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        yield from rows
+
+
+def _connect_for_report() -> sqlite3.Connection:
+    """Open a connection tuned for the report's single large read (big page cache, mmap, in-memory temp b-trees)."""
+    # Read-only: report workers never take a write lock, even by accident
+    conn = sqlite3.connect(f"{Path(DB_PATH).resolve().as_uri()}?mode=ro", uri=True, isolation_level=None)
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute(f'PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size=-{config.SQLITE_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}')
+    return conn
+
+
+def fetch_all_audited_wallets(min_capture_date: str = None, workers: int = None) -> Dict[str, List]:
+    """
+    Fetch all wallets that have been audited, without hardcoded thresholds.
+    Returns the wallets column-wise ({field: [value per wallet]}, keyed by WALLET_COLUMNS,
+    best PnL first) with their top profitable token discoveries.
+    Uses a single JOIN query for optimal performance; with workers > 1 (default
+    config.REPORT_WORKERS) the wallets are split into that many contiguous id ranges,
+    each process runs the query over its range only, and the sorted shards are merged.
+    """
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"Database '{DB_PATH}' not found.")
+    
+    workers = workers or config.REPORT_WORKERS
+    print("📊 Fetching all audited wallets and portfolio data from database...")
+    
+    id_ranges = _wallet_id_ranges(workers) if workers > 1 else []
+    if len(id_ranges) > 1:
+        with ProcessPoolExecutor(max_workers=len(id_ranges)) as pool:
+            shards = list(pool.map(_fetch_wallet_shard, repeat(min_capture_date), id_ranges))
+        columns = _merge_shards(shards)
+    else:
+        _, columns = _fetch_wallet_shard(min_capture_date)
+    
+    _optimize_after_report()
+    print(f"   ✅ Loaded {len(columns['address'])} wallets with portfolio data")
+    return columns
+
+
+def _wallet_id_ranges(count: int) -> List[Tuple[int, int]]:
+    """Split the wallet id span into up to `count` contiguous, inclusive (first, last) ranges."""
+    conn = _connect_for_report()
+    try:
+        low, high = conn.execute('SELECT MIN(id), MAX(id) FROM wallets').fetchone()
+    finally:
+        conn.close()
+    if low is None:
+        return []
+    step = -(-(high - low + 1) // count)  # ceiling division
+    return [(first, min(first + step - 1, high)) for first in range(low, high + 1, step)]
+
+
+def _optimize_after_report():
+    """
+    Let SQLite refresh the statistics the report query showed it could use (cheap when
+    nothing changed). Needs a writable connection, so it runs once after the read-only
+    shards; a busy database only costs the refresh, never the report.
+    """
+    try:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        try:
+            conn.execute(f'PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}')
+            conn.execute('PRAGMA optimize')
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"   ⚠️  PRAGMA optimize skipped: {e}")
+
+
+def _shard_order(shard: int, wallet_ids: List[int], pnls: List[float]) -> Iterator[tuple]:
+    """Merge keys for one shard's rows, in the query's order (PnL descending, then wallet id)."""
+    for row, (wid, pnl) in enumerate(zip(wallet_ids, pnls)):
+        yield -pnl, wid, shard, row
+
+
+def _merge_shards(shards: List[tuple]) -> Dict[str, List]:
+    """Interleave the shards' (wallet_ids, columns) results into one column set, best PnL first."""
+    merged = {key: [] for key in WALLET_COLUMNS}
+    shard_columns = [columns for _, columns in shards]
+    orders = [_shard_order(shard, wallet_ids, columns['global_pnl']) for shard, (wallet_ids, columns) in enumerate(shards)]
+    for _, _, shard, row in heapq.merge(*orders):
+        columns = shard_columns[shard]
+        for key, values in merged.items():
+            values.append(columns[key][row])
+    return merged
+
+
+def _fetch_wallet_shard(min_capture_date: str = None, id_range: Optional[Tuple[int, int]] = None) -> tuple:
+    """
+    Run the report query over the wallets with ids in the inclusive id_range (all if None).
+    Returns (wallet_ids, columns); top-level so ProcessPoolExecutor workers can run it.
+    """
+    conn = _connect_for_report()
+    cursor = conn.cursor()
+    
+    try:
+        # Single query with LEFT JOIN to get wallets and their portfolio in one go
+        # The id range goes into both CTEs, ahead of their window functions, as a range seek on
+        # the wallet_id-leading indexes, so each shard only reads its own wallets' rows; the
+        # inner join to latest_stats then drops everything else
+        stats_shard = ""
+        portfolio_shard = ""
+        shard_params = []
+        date_filter = ""
+        
+        if id_range is not None:
+            stats_shard = "WHERE wallet_id BETWEEN ? AND ?"
+            portfolio_shard = "AND wallet_id BETWEEN ? AND ?"
+            shard_params = list(id_range)
+        params = shard_params * 2 + [TOP_DISCOVERIES]
+        
+        if min_capture_date:
+            date_filter = "AND cs.captured_at >= ?"
+            params.append(min_capture_date)
+        
+        # Single optimized query with LEFT JOIN; window functions pick each wallet's latest
+        # snapshot in one pass over cielo_stats (no MAX(id) IN-list) and rank/count its
+        # profitable tokens (NULL PnL counts as break-even), so only the top TOP_DISCOVERIES
+        # token rows per wallet are joined and the rest arrive as a single count
+        cursor.execute(f'''
+            WITH latest_stats AS (
+                SELECT 
+                    wallet_id,
+                    pnl_usd,
+                    trades_30d,
+                    captured_at,
+                    ROW_NUMBER() OVER (PARTITION BY wallet_id ORDER BY id DESC) as rn
+                FROM cielo_stats
+                {stats_shard}
+            ),
+            profitable_tokens AS (
+                SELECT
+                    wallet_id,
+                    symbol,
+                    token_address,
+                    pnl_usd,
+                    num_swaps,
+                    ROW_NUMBER() OVER (PARTITION BY wallet_id ORDER BY pnl_usd DESC) as token_rank,
+                    COUNT(*) OVER (PARTITION BY wallet_id) as profitable_count
+                FROM wallet_portfolio
+                WHERE COALESCE(pnl_usd, 0) >= 0
+                {portfolio_shard}
+            )
+            SELECT 
+                w.id,
+                w.address,
+                cs.pnl_usd as global_pnl,
+                cs.trades_30d as global_trades,
+                cs.captured_at,
+                pt.profitable_count,
+                pt.symbol,
+                pt.token_address,
+                pt.pnl_usd as token_pnl,
+                pt.num_swaps
+            FROM wallets w
+            JOIN latest_stats cs ON w.id = cs.wallet_id
+            LEFT JOIN profitable_tokens pt ON w.id = pt.wallet_id AND pt.token_rank <= ?
+            WHERE cs.rn = 1
+            {date_filter}
+            ORDER BY COALESCE(cs.pnl_usd, 0) DESC, w.id, pt.token_rank
+        ''', params)
+        
+        # Append each wallet straight onto the columns the page reads (no per-wallet dict).
+        # A wallet's rows are contiguous (ordered by its PnL, then id), so a change of id starts
+        # the next one; each token is a (symbol, pnl_on_token, address, swaps) tuple, which the
+        # page script indexes by position
+        wallet_ids = []
+        addresses, global_pnls, global_pnl_strs, global_trades, captured_ats, top_discoveries, remaining_profitable = columns = (
+            [], [], [], [], [], [], []
+        )
+        last_wid = None
+        discoveries = None
+        
+        for wid, address, pnl, trades, cap_at, profitable_count, symbol, token_addr, token_pnl, swaps in _iter_rows(cursor):
+            if wid != last_wid:
+                last_wid = wid
+                wallet_ids.append(wid)
+                addresses.append(address)
+                global_pnls.append(pnl or 0)
+                global_pnl_strs.append(format_usd(pnl or 0))
+                global_trades.append(trades or 0)
+                captured_ats.append(cap_at)
+                discoveries = []
+                top_discoveries.append(discoveries)
+                remaining_profitable.append(max((profitable_count or 0) - TOP_DISCOVERIES, 0))
+            
+            # LEFT JOIN gives one row with NULL token columns to wallets without profitable tokens
+            if symbol is not None:
+                discoveries.append((symbol, token_pnl, token_addr, swaps))
+        
+        return wallet_ids, dict(zip(WALLET_COLUMNS, columns))
+        
+    finally:
+        conn.close()
+
+
+def generate_html(min_capture_date: str = None, report_type: str = 'SESSION', external_data: bool = False):
+    """Generate the elite wallets HTML report.
+    
+    Args:
+        min_capture_date: Optional date string to filter wallets from that date onwards.
+        report_type: 'ALL' for full dump, 'SESSION' for dated report.
+        external_data: Write the wallets to a sibling wallets-*.json.gz that the page fetches,
+            instead of inlining them. Much smaller, but the page must be served over HTTP
+            (browsers block fetch() from file:// pages).
+    """
+    try:
+        wallets = fetch_all_audited_wallets(min_capture_date=min_capture_date)
+        wallet_count = len(wallets['address'])
+    except FileNotFoundError as error:
+        print(f"❌ Error: {error}")
+        return
+    except sqlite3.Error as error:
+        print(f"❌ Database error: {error}")
+        return
+    
+    if not wallet_count:
+        print("ℹ️ No audited wallets found in database.")
+        return
+
+    # Determine filename and banner based on report type
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    
+    if report_type == 'ALL':
+        filename = "wallet-stats-all.html"
+        data_filename = "wallets-all.json.gz"
+        banner_html = f"""
+            <div style="background: linear-gradient(90deg, #d29922 0%, #9e6a03 100%); color: #0d1117; padding: 10px; text-align: center; font-weight: bold; border-radius: 8px; margin-bottom: 20px;">
+                ⚠️ FULL DATABASE EXPORT • All {wallet_count} tracked wallets • {today_str}
+            </div>
+        """
+    else:
+        filename = f"wallet-stats-{today_str}.html"
+        data_filename = f"wallets-{today_str}.json.gz"
+        banner_html = f"""
+            <div style="background: linear-gradient(90deg, #3fb950 0%, #2ea043 100%); color: #0d1117; padding: 10px; text-align: center; font-weight: bold; border-radius: 8px; margin-bottom: 20px;">
+                📅 SESSION REPORT • {today_str} • {wallet_count} wallets
+            </div>
+        """
+
+    output_path = config.DATA_DIR / filename
+    
+    # Summary for the unfiltered list, so the page doesn't re-reduce every wallet on load
+    summary = {
+        'count': wallet_count,
+        'total_pnl': sum(wallets['global_pnl']),
+        'profitable': sum(1 for pnl in wallets['global_pnl'] if pnl > 0)
+    }
+    
+    # The page gets the wallet columns plus the interned token pool they index into
+    page_data = {**wallets, 'tokens': intern_tokens(wallets['top_discoveries'])}
+    
+    # Stream the report: static template parts around the banner/counts, with the
+    # wallet list encoded one wallet at a time, so no whole-report string is ever built
     with open(output_path, "w", encoding="utf-8") as output_file:
-        output_file.write(html)
+        output_file.write(HEAD_HTML)
+        output_file.write(STYLE_MIN)
+        output_file.write(BODY_OPEN_HTML)
+        output_file.write(banner_html)
+        output_file.writelines(render_template(MID_TEMPLATE, wallet_count=wallet_count, summary_json=dumps_json(summary)))
+        if external_data:
+            output_file.write('null')
+            output_file.write(SCRIPT_MIN)
+            output_file.writelines(render_template(EXTERNAL_END_TEMPLATE, data_url=dumps_json(data_filename)))
+        else:
+            output_file.writelines(iter_json_columns(page_data))
+            output_file.write(SCRIPT_MIN)
+            output_file.write(INLINE_END_HTML)
+    
+    if external_data:
+        data_path = config.DATA_DIR / data_filename
+        with gzip.open(data_path, "wt", encoding="utf-8", compresslevel=6) as data_file:
+            data_file.writelines(iter_json_columns(page_data))
+        print(f"   🗜️  Wallet data written: {data_path}")
     
     print(f"✅ Full Report generated: {output_path}")
-    print(f"   📊 {len(wallets)} wallets processed.")
+    print(f"   📊 {wallet_count} wallets processed.")
     
     import webbrowser
     report_url = Path(output_path).as_uri()
@@ -643,6 +1155,8 @@ if __name__ == "__main__":
                         help='Minimum capture date (e.g., 2026-01-01)')
     parser.add_argument('--type', type=str, choices=['ALL', 'SESSION'], default='SESSION',
                         help="Report type: 'ALL' for full database, 'SESSION' for dated report")
+    parser.add_argument('--external-data', action='store_true',
+                        help='Write wallets to a sibling .json.gz fetched by the page (serve the folder over HTTP)')
     args = parser.parse_args()
-    generate_html(min_capture_date=args.date, report_type=args.type)
+    generate_html(min_capture_date=args.date, report_type=args.type, external_data=args.external_data)
 
@@ -3,11 +3,18 @@ Logging Framework
 Provides structured logging with file rotation for overnight runs.
 """
 
+import atexit
+import copy
+import io
 import logging
+import os
 import sys
+import threading
+import time
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import SimpleQueue
 from typing import Optional
 
 # Import config (handle circular import)
@@ -71,14 +78,15 @@ class WalletFinderLogger:
         self._setup_handlers()
     
     def _setup_handlers(self):
-        """Configure console and file handlers."""
+        """Configure console and file handlers, driven by a background QueueListener."""
         log_level = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
+        handlers = []
         
         # Console handler with colors
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(ColoredFormatter())
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler with rotation
         if LOG_TO_FILE:
@@ -86,7 +94,7 @@ class WalletFinderLogger:
             
             # Main log file
             log_file = LOGS_DIR / f"wallet_finder_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = RotatingFileHandler(
+            file_handler = FastRotatingFileHandler(
                 log_file,
                 maxBytes=LOG_MAX_SIZE_MB * 1024 * 1024,
                 backupCount=LOG_BACKUP_COUNT,
@@ -97,11 +105,11 @@ class WalletFinderLogger:
                 '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
             
             # Separate error log
             error_file = LOGS_DIR / "errors.log"
-            error_handler = RotatingFileHandler(
+            error_handler = FastRotatingFileHandler(
                 error_file,
                 maxBytes=LOG_MAX_SIZE_MB * 1024 * 1024,
                 backupCount=LOG_BACKUP_COUNT,
@@ -112,25 +120,48 @@ class WalletFinderLogger:
                 '%(asctime)s | %(levelname)-8s | %(message)s\n',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            self.logger.addHandler(error_handler)
+            handlers.append(error_handler)
+        
+        # Callers only enqueue records; formatting and the console/file writes happen on the
+        # listener's thread, so logging never blocks the async pipeline on disk I/O
+        self._handlers = handlers
+        self._log_queue = SimpleQueue()
+        self._listener = QueueListener(self._log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self.logger.addHandler(_LocalQueueHandler(self._log_queue))
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """
+        Drain queued records, stop the listener and flush every handler's buffer; later records
+        are handled synchronously. Safe to call repeatedly (atexit, force-quit paths).
+        """
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            self.logger.handlers = list(self._handlers)
+        for handler in self._handlers:
+            handler.flush()
     
-    def debug(self, message: str):
-        self.logger.debug(message)
+    # Extra positional args are %-format arguments, applied only if the record is emitted
+    def debug(self, message: str, *args):
+        self.logger.debug(message, *args)
     
-    def info(self, message: str):
-        self.logger.info(message)
+    def info(self, message: str, *args):
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         self.warning_count += 1
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str, exc_info: bool = False):
+    def error(self, message: str, *args, exc_info: bool = False):
         self.error_count += 1
-        self.logger.error(message, exc_info=exc_info)
+        self.logger.error(message, *args, exc_info=exc_info)
     
-    def critical(self, message: str, exc_info: bool = True):
+    def critical(self, message: str, *args, exc_info: bool = True):
         self.error_count += 1
-        self.logger.critical(message, exc_info=exc_info)
+        self.logger.critical(message, *args, exc_info=exc_info)
+
     
     def api_alert(self, api_name: str, message: str, expected: str = None, got: str = None):
         """
@@ -175,28 +206,116 @@ class WalletFinderLogger:
             self.logger.info(f"Logs saved to: {LOGS_DIR}")
         
         self.logger.info("=" * 60)
+        self.stop()
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler tuned for high log volume:
+    - checks the log path is a regular file once per opened stream, instead of
+      stat()ing it twice on every record in shouldRollover
+    - writes through a 64 KiB buffer that is flushed for WARNING and above, by a
+      background thread every FLUSH_INTERVAL seconds, on rollover/close and by
+      WalletFinderLogger.stop() (atexit, force quit), instead of one write() syscall
+      per record
+    """
+    
+    BUFFER_SIZE = 64 * 1024
+    FLUSH_INTERVAL = 1.0  # seconds
+    
+    def __init__(self, *args, **kwargs):
+        self._deferring = False
+        self._stop_flushing = threading.Event()
+        super().__init__(*args, **kwargs)
+        threading.Thread(target=self._flush_periodically, name="log-flush", daemon=True).start()
+    
+    def _open(self):
+        # write_through hands every record straight to the binary buffer (a memory copy, no
+        # syscall), so the buffer's position is exact for the rollover check
+        stream = io.TextIOWrapper(open(self.baseFilename, self.mode + 'b', buffering=self.BUFFER_SIZE),
+                                  encoding=self.encoding, errors=self.errors, write_through=True)
+        self._is_regular_file = os.path.isfile(self.baseFilename)
+        return stream
+    
+    def emit(self, record):
+        # StreamHandler.emit flushes after every record; below WARNING leave that to the buffer
+        self._deferring = record.levelno < logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._deferring = False
+    
+    def flush(self):
+        # Under the handler lock, so the flush thread never reads another thread's mid-emit flag
+        with self.lock:
+            if not self._deferring:
+                super().flush()
+    
+    def close(self):
+        self._stop_flushing.set()
+        super().close()
+    
+    def _flush_periodically(self):
+        while not self._stop_flushing.wait(self.FLUSH_INTERVAL):
+            self.flush()
+    
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        # Never roll over anything but a regular file (e.g. /dev/null), same as the stdlib check
+        if self.maxBytes <= 0 or not self._is_regular_file:
+            return False
+        # The binary buffer's tell() counts unflushed bytes without flushing them (the text
+        # layer's tell() would flush on every record)
+        pos = self.stream.buffer.tell()
+        if not pos:
+            return False
+        return pos + len("%s\n" % self.format(record)) >= self.maxBytes
+
+
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler for an in-process queue: records are never pickled, so only the %-args are
+    resolved up front (they may be mutated later) and exc_info is left for each handler's formatter."""
+    
+    def prepare(self, record):
+        # Copy first, as the stdlib prepare does: other handlers/filters may still see the original
+        msg = record.getMessage()
+        record = copy.copy(record)
+        record.msg = msg
+        record.args = None
+        return record
 
 
 class ColoredFormatter(logging.Formatter):
-    """Custom formatter with colors for console output."""
+    """Custom formatter with colors for console output (plain text when stdout isn't a terminal)."""
     
-    def format(self, record):
-        # Get color and emoji for this level
-        level_name = record.levelname
-        color = WalletFinderLogger.COLORS.get(level_name, '')
-        reset = WalletFinderLogger.COLORS['RESET']
-        emoji = WalletFinderLogger.EMOJI.get(level_name, '')
+    def __init__(self, use_color: Optional[bool] = None):
+        super().__init__()
+        # (second, HH:MM:SS text) of the last record; records mostly arrive within the same
+        # second. One tuple, replaced in a single assignment, so concurrent formats can't mix pairs
+        self._ts_cache = (None, '')
+        if use_color is None:
+            use_color = sys.stdout is not None and sys.stdout.isatty()
         
-        # Format timestamp
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        # Build message
-        if level_name in ('DEBUG',):
-            formatted = f"{color}[{timestamp}] {record.getMessage()}{reset}"
-        else:
-            formatted = f"{emoji} {color}[{timestamp}] {record.getMessage()}{reset}"
+        # Everything before the timestamp, built once per level: emoji (not for DEBUG) and color
+        self._prefix = {}
+        for level_name, emoji in WalletFinderLogger.EMOJI.items():
+            color = WalletFinderLogger.COLORS[level_name] if use_color else ''
+            lead = '' if level_name == 'DEBUG' else f"{emoji} "
+            self._prefix[level_name] = f"{lead}{color}["
+        self._default_prefix = " ["
+        self._suffix = WalletFinderLogger.COLORS['RESET'] if use_color else ''
+    
+    def format(self, record):
+        # Format timestamp from the record's creation time, rendered once per second
+        sec = int(record.created)
+        cached_sec, timestamp = self._ts_cache
+        if sec != cached_sec:
+            timestamp = time.strftime('%H:%M:%S', time.localtime(sec))
+            self._ts_cache = (sec, timestamp)
         
-        return formatted
+        prefix = self._prefix.get(record.levelname, self._default_prefix)
+        return f"{prefix}{timestamp}] {record.getMessage()}{self._suffix}"
 
 
 # Global logger instance
@@ -214,4 +333,6 @@ def get_logger() -> WalletFinderLogger:
 def reset_logger():
     """Reset the global logger (useful for testing)."""
     global _logger
+    if _logger is not None:
+        _logger.stop()
     _logger = None
@@ -3,19 +3,23 @@ Queue Manager
 Synchronizes the manual_tokens.txt queue with the database.
 
 Logic:
-1. Reads all discovered tokens from 'wallet_portfolio' table.
-2. Reads all already processed tokens from 'tokens' table.
-3. Calculates pending tokens (Discovered - Processed).
-4. Updates 'manual_tokens.txt' with the pending list, preserving user comments.
+1. Asks SQLite for pending tokens: discovered in 'wallet_portfolio' but not yet
+   processed into the 'tokens' table (the set difference runs in the database).
+2. Keeps tokens added to 'manual_tokens.txt' by hand that haven't been processed yet.
+3. Updates 'manual_tokens.txt' with the pending list, preserving user comments.
 """
 
 import sqlite3
 import os
+import json
 import config
 from logger import get_logger
 
 logger = get_logger()
 
+# Rows pulled from SQLite per fetchmany() call while building the pending set
+FETCH_BATCH_SIZE = 10000
+
 def sync_queue():
     db_path = str(config.DB_PATH)
     manual_tokens_path = config.MANUAL_TOKENS_PATH
@@ -30,20 +34,29 @@ def sync_queue():
     cursor = conn.cursor()
     
     try:
-        # 1. Get all tokens that HAVE been processed (Table: tokens)
-        cursor.execute("SELECT address FROM tokens")
-        processed_tokens = {row[0] for row in cursor.fetchall()}
-        print(f"   📚 Processed Tokens (History): {len(processed_tokens)}")
-        
-        # 2. Get all tokens discovered in portfolios (Table: wallet_portfolio)
-        cursor.execute("SELECT DISTINCT token_address FROM wallet_portfolio WHERE token_address IS NOT NULL AND length(token_address) > 30")
-        discovered_tokens = {row[0] for row in cursor.fetchall()}
-        print(f"   🌍 Discovered Tokens (Total): {len(discovered_tokens)}")
+        # 1. Processed tokens (Table: tokens), only counted
+        cursor.execute("SELECT COUNT(*) FROM tokens")
+        print(f"   📚 Processed Tokens (History): {cursor.fetchone()[0]}")
         
-        # 3. Calculate Pending (Discovered - Processed)
-        pending_tokens = discovered_tokens - processed_tokens
+        # 2. Pending = discovered in portfolios minus processed, computed by SQLite over
+        # the token_address/address indexes, so neither full set is loaded into Python
+        cursor.execute('''
+            SELECT DISTINCT token_address FROM wallet_portfolio
+            WHERE token_address IS NOT NULL AND length(token_address) > 30
+            EXCEPT
+            SELECT address FROM tokens
+        ''')
+        # Fed in fetchmany batches so no full list of row tuples is built next to the set
+        cursor.arraysize = FETCH_BATCH_SIZE
+        pending_tokens = set()
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            pending_tokens.update(row[0] for row in rows)
+        print(f"   🌍 Discovered & Unprocessed Tokens: {len(pending_tokens)}")
         
-        # 4. Read manual_tokens.txt to preserve comments
+        # 3. Read manual_tokens.txt to preserve comments
         comments = []
         existing_manual = set()
         
@@ -53,28 +66,26 @@ def sync_queue():
                     original = line
                     line = line.strip()
                     if line.startswith("#"):
-                        comments.append(original)
+                        comments.append(original if original.endswith('\n') else original + '\n')
                     elif line:
                         existing_manual.add(line)
         
         # Add any tokens manually added to the file that aren't in DB yet
         # (This protects manually added tokens that haven't been run yet)
-        manually_added_pending = existing_manual - processed_tokens
+        cursor.execute(
+            "SELECT address FROM tokens WHERE address IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(existing_manual)),)
+        )
+        manually_added_pending = existing_manual.difference(row[0] for row in cursor)
         final_queue = pending_tokens.union(manually_added_pending)
         
         print(f"   ⏳ Pending Queue Size: {len(final_queue)}")
         
-        # 5. Write back to file
+        # 4. Write back to file: comments first, then pending tokens sorted, as one write
+        parts = list(comments)
+        parts.extend(f"{token}\n" for token in sorted(final_queue))
         with open(manual_tokens_path, 'w') as f:
-            # Write comments first
-            for comment in comments:
-                f.write(comment)
-                if not comment.endswith('\n'):
-                    f.write('\n')
-            
-            # Write pending tokens sorted
-            for token in sorted(final_queue):
-                f.write(f"{token}\n")
+            f.write(''.join(parts))
                 
         print(f"✅ Queue updated! {len(final_queue)} tokens ready for top-trader.py")
         print(f"   📁 File: {manual_tokens_path}")
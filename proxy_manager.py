@@ -3,18 +3,20 @@ Proxy Manager - Smart Rotation & Health Tracking
 Manages residential proxies with automatic failover and health monitoring.
 """
 
+import heapq
 import os
 import random
 import time
-from typing import Optional, List, Dict
-from dataclasses import dataclass, field
+from collections import deque
+from typing import Optional, List, Dict, Collection, Deque, Set, Tuple
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True)
 class ProxyHealth:
     """Tracks health metrics for a single proxy."""
     success_count: int = 0
@@ -43,7 +45,8 @@ class ProxyManager:
     Intelligent proxy rotation with health tracking.
     
     Features:
-    - Round-robin rotation with health awareness
+    - Round-robin (deque) or success-weighted rotation with health awareness
+    - Cooldowns kept in a min-heap, so expiry checks and the all-cooling fallback are O(log N)
     - Automatic cooldown for failing proxies
     - Failover to healthy proxies
     - Statistics tracking
@@ -52,12 +55,22 @@ class ProxyManager:
     # Cooldown duration after 3 consecutive failures (seconds)
     COOLDOWN_DURATION = 60
     
+    # Added to weights so proxies with a 0% success rate keep a small chance of being picked
+    WEIGHT_EPSILON = 0.05
+    
     def __init__(self):
         self.proxies: List[str] = []
         self.health: Dict[str, ProxyHealth] = {}
-        self.current_index: int = 0
         self.enabled: bool = False
         self._load_proxies()
+        
+        # Rotation order of the proxies not known to be cooling down. A proxy that starts
+        # cooling is dropped lazily when it reaches the front, so a failure never scans this
+        self._rotation: Deque[str] = deque(self.proxies)
+        self._in_rotation: Set[str] = set(self.proxies)
+        # Min-heap of (cooldown_until, proxy); an entry is stale once its proxy recovered or
+        # had its cooldown extended (checked against ProxyHealth when popped)
+        self._cooling: List[Tuple[float, str]] = []
     
     def _load_proxies(self):
         """Load proxies from environment variables."""
@@ -102,40 +115,104 @@ class ProxyManager:
             print(f"⚠️  Invalid proxy format: [REDACTED] (expected host:port:user:pass or host:port)")
             return None
     
-    def get_proxy(self) -> Optional[str]:
+    def get_proxy(self, strategy: str = "round_robin", exclude: Optional[Collection[str]] = None) -> Optional[str]:
         """
         Get the next healthy proxy using smart rotation.
+        
+        strategy: "round_robin" (default) or "weighted" (random, weighted by success rate)
+        exclude: proxies to avoid (e.g. the one that just failed); ignored if nothing else is healthy
+        
         Returns None if proxies are disabled or all are unhealthy.
         """
         if not self.enabled or not self.proxies:
             return None
         
-        # Try to find a healthy proxy, starting from current index
-        attempts = 0
-        while attempts < len(self.proxies):
-            proxy = self.proxies[self.current_index]
-            health = self.health[proxy]
-            
-            # Check if cooldown has expired
-            if health.is_cooling_down and time.time() >= health.cooldown_until:
+        self._release_expired_cooldowns()
+        
+        if strategy == "weighted":
+            proxy = self._pick_weighted(exclude)
+        else:
+            proxy = self._pick_round_robin(exclude)
+        
+        if proxy is not None:
+            self.health[proxy].last_used = time.time()
+            return proxy
+        
+        # All proxies are unhealthy - force use the one whose cooldown ends first
+        print("⚠️  All proxies in cooldown, using least-recently-used")
+        oldest = self._pop_soonest_cooldown()
+        self.health[oldest].is_cooling_down = False
+        return oldest
+    
+    def has_usable_proxy(self) -> bool:
+        """Whether any proxy is healthy right now (False when disabled or all are cooling down)."""
+        if not self.enabled or not self.proxies:
+            return False
+        self._release_expired_cooldowns()
+        return any(self.health[p].is_healthy for p in self._rotation)
+    
+    def _is_current_cooldown(self, proxy: str, cooldown_until: float) -> bool:
+        """Whether a heap entry still describes the proxy's cooldown."""
+        health = self.health[proxy]
+        return health.is_cooling_down and health.cooldown_until == cooldown_until
+    
+    def _add_to_rotation(self, proxy: str):
+        """Put a proxy back at the end of the rotation unless it is already in it."""
+        if proxy not in self._in_rotation:
+            self._in_rotation.add(proxy)
+            self._rotation.append(proxy)
+    
+    def _release_expired_cooldowns(self):
+        """Clear cooldowns that have ended (soonest first, off the heap) and rejoin the rotation."""
+        now = time.time()
+        cooling = self._cooling
+        while cooling and cooling[0][0] <= now:
+            cooldown_until, proxy = heapq.heappop(cooling)
+            if self._is_current_cooldown(proxy, cooldown_until):
+                health = self.health[proxy]
                 health.is_cooling_down = False
                 health.consecutive_failures = 0
                 print(f"🔄 Proxy {self._mask_proxy(proxy)} recovered from cooldown")
-            
-            # Rotate index for next call
-            self.current_index = (self.current_index + 1) % len(self.proxies)
-            
-            if health.is_healthy:
-                health.last_used = time.time()
+                self._add_to_rotation(proxy)
+    
+    def _pop_soonest_cooldown(self) -> str:
+        """The cooling proxy whose cooldown ends first, taken off the heap."""
+        while self._cooling:
+            cooldown_until, proxy = heapq.heappop(self._cooling)
+            if self._is_current_cooldown(proxy, cooldown_until):
                 return proxy
-            
-            attempts += 1
+        return min(self.proxies, key=lambda p: self.health[p].cooldown_until)
+    
+    def _pick_round_robin(self, exclude: Optional[Collection[str]]) -> Optional[str]:
+        """Next healthy, non-excluded proxy in rotation order; an excluded one only if nothing else is healthy."""
+        rotation = self._rotation
+        fallback = None
+        for _ in range(len(rotation)):
+            proxy = rotation.popleft()
+            if not self.health[proxy].is_healthy:
+                # Cooling down: rejoins via _release_expired_cooldowns or report_success
+                self._in_rotation.discard(proxy)
+                continue
+            rotation.append(proxy)
+            if exclude and proxy in exclude:
+                if fallback is None:
+                    fallback = proxy
+                continue
+            return proxy
+        return fallback
+    
+    def _pick_weighted(self, exclude: Optional[Collection[str]]) -> Optional[str]:
+        """Random healthy proxy, weighted by success rate; falls back to excluded ones if needed."""
+        healthy = [p for p in self._rotation if self.health[p].is_healthy]
         
-        # All proxies are unhealthy - force use the oldest cooldown one
-        print("⚠️  All proxies in cooldown, using least-recently-used")
-        oldest = min(self.proxies, key=lambda p: self.health[p].cooldown_until)
-        self.health[oldest].is_cooling_down = False
-        return oldest
+        candidates = [p for p in healthy if p not in exclude] if exclude else healthy
+        if not candidates:
+            candidates = healthy
+        if not candidates:
+            return None
+        
+        weights = [self.health[p].success_rate + self.WEIGHT_EPSILON for p in candidates]
+        return random.choices(candidates, weights=weights)[0]
     
     def report_success(self, proxy: str):
         """Report a successful request through this proxy."""
@@ -145,6 +222,7 @@ class ProxyManager:
             proxy_health.consecutive_failures = 0
             proxy_health.last_success = time.time()
             proxy_health.is_cooling_down = False
+            self._add_to_rotation(proxy)
     
     def report_failure(self, proxy: str, is_rate_limit: bool = False):
         """
@@ -161,6 +239,7 @@ class ProxyManager:
             if proxy_health.consecutive_failures >= 3:
                 proxy_health.is_cooling_down = True
                 proxy_health.cooldown_until = time.time() + self.COOLDOWN_DURATION
+                heapq.heappush(self._cooling, (proxy_health.cooldown_until, proxy))
                 print(f"🧊 Proxy {self._mask_proxy(proxy)} entering {self.COOLDOWN_DURATION}s cooldown")
     
     def _mask_proxy(self, proxy: str) -> str:
@@ -173,23 +252,30 @@ class ProxyManager:
     
     def get_stats(self) -> Dict:
         """Get statistics for all proxies."""
-        stats = {
-            "total": len(self.proxies),
-            "healthy": sum(1 for p in self.proxies if self.health[p].is_healthy),
-            "in_cooldown": sum(1 for p in self.proxies if self.health[p].is_cooling_down),
-            "proxies": []
-        }
+        proxies = []
+        healthy = in_cooldown = 0
         
+        # One pass over the health records; is_healthy reads the clock, so evaluate it once
         for proxy in self.proxies:
             h = self.health[proxy]
-            stats["proxies"].append({
+            is_healthy = h.is_healthy
+            healthy += is_healthy
+            in_cooldown += h.is_cooling_down
+            proxies.append({
                 "proxy": self._mask_proxy(proxy),
                 "success": h.success_count,
                 "failures": h.failure_count,
                 "success_rate": f"{h.success_rate:.1%}",
-                "healthy": h.is_healthy
+                "healthy": is_healthy
             })
         
+        stats = {
+            "total": len(self.proxies),
+            "healthy": healthy,
+            "in_cooldown": in_cooldown,
+            "proxies": proxies
+        }
+        
         return stats
     
     def print_stats(self):
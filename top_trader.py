@@ -16,21 +16,25 @@ import random
 import uuid
 import os
 import re
+import sqlite3
 from datetime import datetime
+from urllib.parse import urlsplit
 from typing import Optional, List, Dict, Set, Tuple
 from db_manager import DatabaseManager
 from proxy_manager import get_proxy_manager, ProxyManager
-from api_validators import GMGNValidator, run_preflight_checks
+from api_validators import GMGNValidator, parse_json, run_preflight_checks
 from logger import get_logger
 from base_api_client import BaseAPIClient
 
 from curl_cffi.requests import AsyncSession
 import config
+from config import CFG
 
 # Delay between API batches (in seconds) to avoid rate limiting
-API_DELAY = config.API_DELAY
-MAX_CONCURRENT_TOKENS = config.MAX_CONCURRENT_TOKENS
-MAX_GLOBAL_REQUESTS = config.MAX_GLOBAL_REQUESTS
+API_DELAY = CFG.api_delay
+MAX_CONCURRENT_TOKENS = CFG.max_concurrent_tokens
+MAX_GLOBAL_REQUESTS = CFG.max_global_requests
+GMGN_REQUESTS_PER_SECOND = CFG.gmgn_requests_per_second
 
 # Browser Identity for GMGN
 HEADERS = {
@@ -45,16 +49,17 @@ HEADERS = {
 class WalletFinder(BaseAPIClient):
     """Fetch and analyze wallet data from GMGN API using async workers with proxy rotation."""
     
-    BASE_URL = "https://gmgn.ai/vas/api/v1/token_traders/sol"
-    HOLDERS_URL = "https://gmgn.ai/vas/api/v1/token_holders/sol"
-    INFO_URL = "https://gmgn.ai/mrwapi/v1/multi_token_info"
+    BASE_URL = CFG.gmgn_traders_url
+    HOLDERS_URL = CFG.gmgn_holders_url
+    INFO_URL = CFG.gmgn_token_info_url
+    DNS_WARM_HOSTS = tuple(dict.fromkeys(urlsplit(u).hostname for u in (BASE_URL, HOLDERS_URL, INFO_URL)))
     
     def __init__(self, session: AsyncSession, db: DatabaseManager, proxy_manager: ProxyManager):
         super().__init__(
             session=session,
             proxy_manager=proxy_manager,
             max_concurrent_requests=MAX_GLOBAL_REQUESTS,
-            max_retries=3
+            requests_per_second=GMGN_REQUESTS_PER_SECOND
         )
         self.db = db
 
@@ -100,7 +105,7 @@ class WalletFinder(BaseAPIClient):
     async def fetch_trending_tokens(self, timeframe: str) -> List[str]:
         """Scrape trending tokens for a specific timeframe from GMGN rank API."""
         logger = get_logger()
-        url = f"{config.GMGN_RANK_URL}/{timeframe}"
+        url = f"{CFG.gmgn_rank_url}/{timeframe}"
         
         # Fresh identifiers for each request
         params = {
@@ -135,7 +140,7 @@ class WalletFinder(BaseAPIClient):
                 )
                 
                 if response.status_code == 200:
-                    response_data = response.json()
+                    response_data = parse_json(response)
                     validation = GMGNValidator.validate_rank_response(response_data)
                     
                     if validation.valid:
@@ -181,8 +186,11 @@ class WalletFinder(BaseAPIClient):
     async def find_profitable_wallets(
         self,
         contract_address: str,
-    ) -> List[dict]:
-        """Query ALL 6 endpoint combinations concurrently and return hits with token-specific PnL."""
+    ) -> Optional[List[dict]]:
+        """
+        Query ALL 6 endpoint combinations concurrently and return hits with token-specific PnL.
+        Returns None if any endpoint failed, so the token isn't recorded as analyzed.
+        """
             
         fetch_limit = 100
         
@@ -202,6 +210,8 @@ class WalletFinder(BaseAPIClient):
             tasks.append(self.fetch_endpoint(url, params, f"{cat_name}"))
 
         results = await asyncio.gather(*tasks)
+        if any(response.get("code") != 0 for response in results):
+            return None
         
         all_hits = []
 
@@ -239,18 +249,15 @@ async def analyze_token(token: str, finder: WalletFinder, settings: dict, semaph
         symbol = None
         ath_price = None
         
-        # Try to get from database first
+        # Try to get from database first (read pool, off the event loop)
         try:
-            conn = finder.db._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT symbol, ath_price FROM tokens WHERE address = ?", (token,))
-            result = cursor.fetchone()
+            result = await finder.db.async_get_token_info(token)
             if result:
                 symbol, ath_price = result
                 if symbol:
                     print(f"   💾 Token info from cache: {symbol} | ATH: {ath_price}")
-        except Exception:
-            pass  # If DB lookup fails, fall back to API
+        except sqlite3.Error as e:
+            get_logger().warning(f"Token info lookup failed for {token}: {e}")  # fall back to API
         
         # 2. Fetch from API only if not in database
         if symbol is None:
@@ -263,6 +270,10 @@ async def analyze_token(token: str, finder: WalletFinder, settings: dict, semaph
 
         # 3. Get Every Wallet from the response
         hits = await finder.find_profitable_wallets(contract_address=token)
+        if hits is None:
+            # Leave the token unrecorded so manage_queue puts it back in the queue
+            print(f"   ⚠️  Fetch failed for {short_token}, will retry on a later run")
+            return
         
         # 4. Save the token itself to the database (even if no hits found)
         # This prevents us from re-analyzing empty tokens forever
@@ -274,7 +285,7 @@ async def analyze_token(token: str, finder: WalletFinder, settings: dict, semaph
         
         for hit in hits:
             addr = hit["address"]
-            if addr in config.BANNED_WALLETS:
+            if config.is_banned(addr):
                 continue
                 
             batch_hits.append({
@@ -325,52 +336,57 @@ async def main():
         
         
         finder = WalletFinder(session, db, proxy_manager)
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOKENS)
-        
-        # Step 4: Scrape trending tokens from all timeframes
-        timeframes = ["1m", "5m", "1h", "6h", "24h"]
-        print(f"📡 Scraping trending tokens from GMGN ({', '.join(timeframes)})")
-        
-        ticker_tasks = [finder.fetch_trending_tokens(tf) for tf in timeframes]
-        ticker_results = await asyncio.gather(*ticker_tasks)
-        
-        scraped_tokens = set()
-        for res in ticker_results:
-            scraped_tokens.update(res)
-        
-        # Step 5: Merge with manual tokens and ensure uniqueness
-        initial_tokens = list(set(tokens) | scraped_tokens)
-        
-        # Step 6: Filter out already processed tokens
-        existing_tokens = set(await db.async_get_all_token_addresses())
-        all_tokens = [t for t in initial_tokens if t not in existing_tokens]
-        
-        new_tokens_count = len(scraped_tokens - set(tokens))
-        skipped_count = len(initial_tokens) - len(all_tokens)
-        
-        print(f"📊 Tokens: {len(initial_tokens)} found ({len(tokens)} manual + {new_tokens_count} new scraped)")
-        if skipped_count > 0:
-            print(f"   ⏭️  Skipping {skipped_count} tokens already in database")
-        print(f"   🚀 Analyzing {len(all_tokens)} new tokens")
-        
-        if not all_tokens:
-            print("✅ No new tokens to analyze.")
-            return
+        optimize_task = db.start_optimize_task()
+        try:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOKENS)
+            
+            # Step 4: Scrape trending tokens from all timeframes
+            timeframes = ["1m", "5m", "1h", "6h", "24h"]
+            print(f"📡 Scraping trending tokens from GMGN ({', '.join(timeframes)})")
+            
+            ticker_tasks = [finder.fetch_trending_tokens(tf) for tf in timeframes]
+            ticker_results = await asyncio.gather(*ticker_tasks)
+            
+            scraped_tokens = set()
+            for res in ticker_results:
+                scraped_tokens.update(res)
+            
+            # Step 5: Merge with manual tokens and ensure uniqueness
+            initial_tokens = list(set(tokens) | scraped_tokens)
+            
+            # Step 6: Filter out already processed tokens
+            existing_tokens = set(await db.async_get_all_token_addresses())
+            all_tokens = [t for t in initial_tokens if t not in existing_tokens]
+            
+            new_tokens_count = len(scraped_tokens - set(tokens))
+            skipped_count = len(initial_tokens) - len(all_tokens)
+            
+            print(f"📊 Tokens: {len(initial_tokens)} found ({len(tokens)} manual + {new_tokens_count} new scraped)")
+            if skipped_count > 0:
+                print(f"   ⏭️  Skipping {skipped_count} tokens already in database")
+            print(f"   🚀 Analyzing {len(all_tokens)} new tokens")
+            
+            if not all_tokens:
+                print("✅ No new tokens to analyze.")
+                return
 
-        # Step 7: Process all tokens in batches with smart jitter
-        settings = {"exclude_bundlers": exclude_bundlers}
-        batch_size = config.BREAK_AFTER_BATCH
-        
-        for i in range(0, len(all_tokens), batch_size):
-            batch = all_tokens[i:i + batch_size]
-            tasks = [analyze_token(t, finder, settings, semaphore) for t in batch]
-            await asyncio.gather(*tasks)
+            # Step 7: Process all tokens in batches with smart jitter
+            settings = {"exclude_bundlers": exclude_bundlers}
+            batch_size = CFG.break_after_batch
             
-            # Smart break after each batch to mimic human behavior
-            if i + batch_size < len(all_tokens):
-                break_duration = random.uniform(config.BREAK_DURATION_MIN, config.BREAK_DURATION_MAX)
-                print(f"   ☕ Taking a {break_duration:.1f}s break to stay under the radar...")
-                await asyncio.sleep(break_duration)
+            for i in range(0, len(all_tokens), batch_size):
+                batch = all_tokens[i:i + batch_size]
+                tasks = [analyze_token(t, finder, settings, semaphore) for t in batch]
+                await asyncio.gather(*tasks)
+                
+                # Smart break after each batch to mimic human behavior
+                if i + batch_size < len(all_tokens):
+                    break_duration = random.uniform(CFG.break_duration_min, CFG.break_duration_max)
+                    print(f"   ☕ Taking a {break_duration:.1f}s break to stay under the radar...")
+                    await asyncio.sleep(break_duration)
+        finally:
+            optimize_task.cancel()
+            await finder.close()
     
     # Print proxy statistics at the end
     if proxy_manager.enabled:
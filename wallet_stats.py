@@ -542,6 +542,7 @@ def run_with_graceful_shutdown():
         else:
             logger.warning("Force quit requested. Exiting immediately.")
             print("\n🛑 FORCE QUIT!")
+            logger.stop()  # os._exit skips atexit: write out buffered log records first
             os._exit(1)  # Force exit without cleanup
     
     # Register signal handlers